@@ -1,8 +1,15 @@
 from dash import Dash
 from app_components.layout import create_layout
 from app_components.callbacks import register_callbacks
+from app_components.render_cache import background_callback_manager
+from app_components.routes import register_routes
+from app_components.scheduler import start_week_scheduler
 
-app = Dash(__name__, suppress_callback_exceptions=True)
+app = Dash(
+    __name__,
+    suppress_callback_exceptions=True,
+    background_callback_manager=background_callback_manager
+)
 app.title = "Casino Event Calendar"
 
 app.index_string = '''
@@ -31,6 +38,8 @@ app.layout = create_layout(app)
 register_callbacks(app)
 
 server = app.server
+register_routes(server)
+server.before_request(start_week_scheduler)
 
 # Run the Dash app
 if __name__ == '__main__':
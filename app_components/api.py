@@ -0,0 +1,87 @@
+import pandas as pd
+from .data import get_indexed_frame, query_events, range_version
+from .colors import gather_colors
+from .plotting import pack_week_events, block_extents
+from .recurrence import occurrence_at, parse_occurrence_label
+from .render_cache import get_or_render
+from .utils import shift_days
+
+#Column names are sent once per response; rows are plain arrays
+WEEK_COLUMNS = ["id", "row", "x0", "x1", "color", "name", "casino"]
+DAY_COLUMNS = ["id", "name", "casino", "start", "end", "color"]
+EVENT_FIELDS = ["EventName", "Casino", "Location", "Offer"]
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+
+def block_colors(casinos):
+    return gather_colors(pd.Series(casinos, dtype=object))[0].tolist()
+
+#Row-packed blocks for one week, x in day units (0 = Sunday 00:00), same layout the weekly figure draws
+def build_week_payload(store, week_start):
+    week_end = shift_days(week_start, 7)
+    events = query_events(store, week_start, week_end)
+    packed = pack_week_events(events, week_start, week_end)
+    ongoing = events[(events["StartDate"] < week_start) & (events["EndDate"] > week_end)]
+
+    rows = []
+    if not packed.empty:
+        x0, x1 = block_extents(packed)
+        rows = [
+            [int(event_id), int(row), round(start, 4), round(end, 4), color, name, casino]
+            for event_id, row, start, end, color, name, casino in zip(
+                packed["EventId"], packed["row_num"], x0, x1, block_colors(packed["Casino"]),
+                packed["EventName"], packed["Casino"]
+            )
+        ]
+    return {
+        "week": week_start.strftime('%Y-%m-%d'),
+        "columns": WEEK_COLUMNS,
+        "rows": rows,
+        "ongoing": [int(event_id) for event_id in ongoing.index]
+    }
+
+def build_day_payload(store, day_start):
+    events = query_events(store, day_start, shift_days(day_start, 1)).sort_values(["StartDate", "EndDate"], kind="stable")
+    return {
+        "day": day_start.strftime('%Y-%m-%d'),
+        "columns": DAY_COLUMNS,
+        "rows": [
+            [int(event_id), name, casino, start, end, color]
+            for event_id, name, casino, start, end, color in zip(
+                events.index, events["EventName"], events["Casino"],
+                events["StartDate"].dt.strftime(ISO_FORMAT), events["EndDate"].dt.strftime(ISO_FORMAT),
+                block_colors(events["Casino"])
+            )
+        ]
+    }
+
+#Laid out once per version of the week's data and shared through the render cache
+def week_payload(store, week_start):
+    key = ("api-week", range_version(store, week_start), week_start.strftime('%Y-%m-%d'))
+    return get_or_render(key, build_week_payload, store, week_start)
+
+def day_payload(store, day_start):
+    key = ("api-day", range_version(store, day_start), day_start.strftime('%Y-%m-%d'))
+    return get_or_render(key, build_day_payload, store, day_start)
+
+#Ids are the ones week/day/search responses return: row ids, or occurrence ids for recurring events
+def event_payload(store, event_id):
+    df = get_indexed_frame(store)[0]
+    occurrence = parse_occurrence_label(event_id)
+    label = event_id if occurrence is None else occurrence[0]
+    if not 0 <= label < len(df):
+        return None
+
+    row = df.iloc[label]
+    is_template = "RRule" in df.columns and isinstance(row["RRule"], str)
+    if occurrence is not None:
+        row = occurrence_at(row, occurrence[1]) if is_template else None
+        if row is None:
+            return None
+
+    payload = {"id": event_id}
+    payload.update({field: None if pd.isna(row[field]) else row[field] for field in EVENT_FIELDS})
+    payload["start"] = row["StartDate"].strftime(ISO_FORMAT)
+    payload["end"] = row["EndDate"].strftime(ISO_FORMAT)
+    payload["rrule"] = row["RRule"] if occurrence is None and is_template else None
+    payload["color"] = block_colors([row["Casino"]])[0]
+    return payload
@@ -1,44 +1,118 @@
 def register_callbacks(app):
     import dash
-    from dash import html, dcc, Input, Output, State, ctx, no_update
+    import json
+    from dash import html, dcc, Input, Output, State, ALL, ctx, no_update
     import pandas as pd
     from pytz import timezone
     from datetime import datetime, timedelta
-    from .plotting import generate_weekly_view, get_color, generate_day_view_html
-    from .utils import get_dynamic_sizes, PDT
-    from .data import load_event_data
-    from .layout import sticky_header
+    from .plotting import (
+        generate_weekly_view, generate_multiweek_view, build_day_figure, build_day_header,
+        day_graph_style, get_ongoing_events, format_ongoing_lines
+    )
+    from .utils import get_dynamic_sizes, bucket_width, get_week_range, shift_days, BREAKPOINTS, MIN_WEEK_OFFSET, PDT
+    from .data import get_event_store, get_indexed_frame, query_events, range_version, with_occurrences
+    from .recurrence import split_templates
+    from .layout import get_sticky_header, legend_chip_class, week_label_style
+    from .render_cache import cache, get_or_render, week_cache_key
+    from .search import search_events
+    from .scheduler import week_start_for, on_new_week
+    from .geo import filter_casinos
     
     
     PDT = timezone('America/Los_Angeles')
-    df = load_event_data()
+    OVERFLOW_PAGE_SIZE = 20
     
-    #Detect screen width once
+    #Breakpoint bucket of the window width; a resize only reaches the server when the bucket changes
     app.clientside_callback(
         '''
         function(n_intervals) {
-            return window.innerWidth;
+            const breakpoints = %s;
+            const bucketOf = width => breakpoints.filter(b => b <= width).length;
+            if (!window.screenBucketListener) {
+                let current = bucketOf(window.innerWidth);
+                window.screenBucketListener = () => {
+                    const bucket = bucketOf(window.innerWidth);
+                    if (bucket !== current) {
+                        current = bucket;
+                        dash_clientside.set_props('screen-bucket', {data: bucket});
+                    }
+                };
+                window.addEventListener('resize', window.screenBucketListener);
+            }
+            return bucketOf(window.innerWidth);
+        }
+        ''' % json.dumps(BREAKPOINTS),
+        Output('screen-bucket', 'data'),
+        Input('initial-trigger', 'n_intervals')
+    )
+    
+    #Radius filter: the browser supplies the location, the server only ever sees coordinates and a radius
+    app.clientside_callback(
+        '''
+        function(radius) {
+            if (!radius) {
+                return null;
+            }
+            const clear = () => dash_clientside.set_props('near-radius', {value: null});
+            if (!navigator.geolocation) {
+                clear();
+                return null;
+            }
+            navigator.geolocation.getCurrentPosition(
+                pos => dash_clientside.set_props('near-filter', {
+                    data: {lat: pos.coords.latitude, lon: pos.coords.longitude, radius: radius}
+                }),
+                clear
+            );
+            return dash_clientside.no_update;
         }
         ''',
-        Output('screen-width', 'data'),
-        Input('initial-trigger', 'n_intervals'), 
-        State('screen-width', 'data')
+        Output('near-filter', 'data'),
+        Input('near-radius', 'value'),
+        prevent_initial_call=True
     )
     
-    #Sticky header with responsive legend
+    #Sticky header with responsive legend, rebuilt only when the breakpoint, data or filter changes
     @app.callback(
-        Output('sticky-header', 'children'),
-        Input('screen-width', 'data'),
-        Input('week-offset', 'data')
+        Output('sticky-header-content', 'children'),
+        Input('screen-bucket', 'data'),
+        State('casino-filter', 'data')
     )
     
-    def render_sticky_header(screen_width, week_offset):
-        today = datetime.now(PDT)
-        current_sunday = today - timedelta(days=(today.weekday() + 1) % 7)
-        week_start = current_sunday + timedelta(weeks=week_offset)
+    def render_sticky_header(screen_bucket, selected_casinos):
+        return get_sticky_header(get_event_store(), bucket_width(screen_bucket), selected_casinos)
+
+    #Week label is the only part of the header that changes with navigation
+    @app.callback(
+        Output('week-label', 'children'),
+        Output('week-label', 'style'),
+        Input('week-offset', 'data'),
+        Input('screen-bucket', 'data')
+    )
+
+    def render_week_label(week_offset, screen_bucket):
+        week_start = week_start_for(week_offset)
         week_label = f"Events for the Week of {week_start.strftime('%B %d')} - {(week_start + timedelta(days=6)).strftime('%B %d, %Y')}"
         
-        return sticky_header(screen_width, week_label)
+        return week_label, week_label_style(*get_dynamic_sizes(bucket_width(screen_bucket)))
+
+    #Legend chips toggle casinos in and out of the filter
+    @app.callback(
+        Output('casino-filter', 'data'),
+        Output({'type': 'casino-chip', 'casino': ALL}, 'className'),
+        Input({'type': 'casino-chip', 'casino': ALL}, 'n_clicks'),
+        State('casino-filter', 'data'),
+        prevent_initial_call=True
+    )
+
+    def toggle_casino_filter(chip_clicks, selected_casinos):
+        #Ignore the chips being re-created when the header re-renders
+        if not ctx.triggered_id or not any(chip_clicks):
+            return no_update, no_update
+
+        selected = set(selected_casinos or []) ^ {ctx.triggered_id['casino']}
+        chip_classes = [legend_chip_class(output['id']['casino'], selected) for output in ctx.outputs_list[1]]
+        return sorted(selected), chip_classes
 
     #Update week offset on button clicks
     @app.callback(
@@ -52,31 +126,24 @@ def register_callbacks(app):
     )
 
     def update_week_offset(prev_clicks, next_clicks, current_offset):
-        delta = (next_clicks or 0) - (prev_clicks or 0)
+        #The header persists across weeks, so step by the button pressed rather than click totals
+        delta = {'prev-button': -1, 'next-button': 1}.get(ctx.triggered_id, 0)
         desired_offset = current_offset + delta
         
         #Limit going back no more than 6 weeks
-        desired_offset = max(-6, desired_offset)
+        desired_offset = max(MIN_WEEK_OFFSET, desired_offset)
             
         #Limit forward navigation if next 4 weeks are empty
-        today = datetime.now(PDT)
-        current_sunday = today - timedelta(days=(today.weekday() + 1) % 7)
-        start_sunday = current_sunday + timedelta(weeks=desired_offset)
-        rolling_weeks = [start_sunday + timedelta(weeks=i) for i in range(4)]
-        
-        next_week_offset = desired_offset + 1
-        next_week_start = current_sunday + timedelta(weeks=next_week_offset)
+        next_week_start = week_start_for(desired_offset + 1)
         next_week_end = next_week_start + timedelta(days=6)
         
-        has_next_week_events = not df[
-            (df['EndDate'] > next_week_start) &
-            (df['StartDate'] < next_week_end)
-        ].empty
+        store = get_event_store()
+        has_next_week_events = not query_events(store, next_week_start, next_week_end).empty
         
         if not has_next_week_events and desired_offset > current_offset:
             desired_offset = current_offset
             
-        prev_disabled = desired_offset <= -6
+        prev_disabled = desired_offset <= MIN_WEEK_OFFSET
         next_disabled = not has_next_week_events
         
         #Dynamic tooltip text for forward navigation
@@ -84,25 +151,109 @@ def register_callbacks(app):
         
         return desired_offset, prev_disabled, next_disabled, next_title
 
+    #Toggle between the single week and the rolling 4-week view
+    @app.callback(
+        Output('view-mode', 'data'),
+        Output('view-toggle', 'children'),
+        Input('view-toggle', 'n_clicks'),
+        prevent_initial_call=True
+    )
+
+    def toggle_view_mode(n_clicks):
+        if n_clicks % 2 == 1:
+            return 'month', "🗓️ Show Single Week"
+        return 'week', "📆 Show 4 Weeks"
+
+    #Render-cache key of the chart for these inputs; appends elsewhere keep it cached
+    def week_chart_key(week_start, store, screen_bucket, view_mode, casinos):
+        version = range_version(store, week_start, 4 if view_mode == 'month' else 1)
+        return week_cache_key(version, week_start, screen_bucket, view_mode) + casinos
+
+    #Cached charts are served straight from the render cache; only a miss is handed to the background job below,
+    #so hits don't pay for starting and polling a job
     @app.callback(
         Output('week-chart-container', 'children'),
         Output('overflow-date', 'data'),
+        Output('chart-request', 'data'),
         Input('week-offset', 'data'),
-        Input('screen-width', 'data'),
+        Input('screen-bucket', 'data'),
+        Input('view-mode', 'data'),
+        Input('casino-filter', 'data'),
+        Input('near-filter', 'data'),
         prevent_initial_call=True
     )
     
-    def render_single_week_chart(week_offset, screen_width):
-        today = datetime.now(PDT)
-        current_sunday = today - timedelta(days=(today.weekday() + 1) % 7)
-        week_start = current_sunday + timedelta(weeks=week_offset)
+    def render_cached_week_chart(week_offset, screen_bucket, view_mode, selected_casinos, near):
+        week_start = week_start_for(week_offset)
+        casinos = filter_casinos(selected_casinos, near)
+        cached = cache.get(week_chart_key(week_start, get_event_store(), screen_bucket, view_mode, casinos))
+        if cached is not None:
+            return *cached, no_update
+        return no_update, no_update, [week_offset, screen_bucket, view_mode, selected_casinos, near]
+
+    #A newer navigation or filter change cancels a render still running for the previous one
+    @app.callback(
+        Output('week-chart-container', 'children', allow_duplicate=True),
+        Output('overflow-date', 'data', allow_duplicate=True),
+        Input('chart-request', 'data'),
+        background=True,
+        cancel=[
+            Input('week-offset', 'data'),
+            Input('screen-bucket', 'data'),
+            Input('view-mode', 'data'),
+            Input('casino-filter', 'data'),
+            Input('near-filter', 'data')
+        ],
+        prevent_initial_call=True
+    )
+    
+    def render_single_week_chart(chart_request):
+        week_offset, screen_bucket, view_mode, selected_casinos, near = chart_request
+        screen_width = bucket_width(screen_bucket)
+        week_start = week_start_for(week_offset)
         
-        fig, overflow_df = generate_weekly_view(week_start, df, screen_width)
+        #Concurrent requests for the same week share one render
+        store = get_event_store()
+        casinos = filter_casinos(selected_casinos, near)
+        key = week_chart_key(week_start, store, screen_bucket, view_mode, casinos)
+        return get_or_render(key, build_week_chart, week_start, store, screen_width, view_mode, casinos)
+
+    #Unfiltered week and 4-week charts at every breakpoint, rendered before the week becomes current
+    @on_new_week
+    def prewarm_week_charts(week_start):
+        store = get_event_store()
+        for view_mode in ('week', 'month'):
+            for screen_bucket in range(len(BREAKPOINTS) + 1):
+                key = week_chart_key(week_start, store, screen_bucket, view_mode, ())
+                get_or_render(key, build_week_chart, week_start, store, bucket_width(screen_bucket), view_mode, ())
+
+    #Events for the rendered weeks: range SQL on SQLite, casino bitmaps and span index in memory,
+    #with recurring templates expanded for just these weeks. Once history is archived the bitmaps
+    #would pull the cold tier back in, so filters run over the (window-sized) hot tier instead.
+    def select_events(store, week_start, n_weeks, casinos):
+        range_start, _ = get_week_range(week_start)
+        range_end = range_start + timedelta(weeks=n_weeks)
+        if store.df is not None and casinos and store.archive is None:
+            positions = search_events(store, casinos=casinos, start=range_start, end=range_end)
+            events, _ = split_templates(get_indexed_frame(store)[0].iloc[positions])
+            return with_occurrences(store, events, range_start, range_end, casinos), None
+        if store.df is None or not store.templates.empty or range_start < store.hot_from:
+            return query_events(store, range_start, range_end, casinos), None
+        return store.df, store.span_index
+
+    def build_week_chart(week_start, store, screen_width, view_mode='week', casinos=()):
+        n_weeks = 4 if view_mode == 'month' else 1
+        df, span_index = select_events(store, week_start, n_weeks, casinos)
+
+        if view_mode == 'month':
+            fig, overflow_df = generate_multiweek_view(week_start, df, screen_width, n_weeks, span_index)
+        else:
+            fig, overflow_df = generate_weekly_view(week_start, df, screen_width, span_index)
         font_sizes, padding_sizes = get_dynamic_sizes(screen_width)
         
         #Overflow content toggle & box
         if not overflow_df.empty:
-            end_date = week_start + timedelta(days=6)
+            end_date = week_start + timedelta(weeks=n_weeks, days=-1)
             
             overflow_toggle = html.Button(
                 f"🌀 Show Ongoing Events for {week_start.strftime('%b %d')} - {end_date.strftime('%b %d')}",
@@ -123,19 +274,33 @@ def register_callbacks(app):
                 id='overflow-box',
                 className='overflow-box',
                 children=[
-                    html.Strong("Ongoing Events This Week:", style={
+                    html.Strong("Ongoing Events This Week:" if n_weeks == 1 else "Ongoing Events These Weeks:", style={
                         'color': '#6A5ACD',
                         'fontSize': font_sizes['overflow'],
                         'display': 'block',
                         'marginBottom': '8px'
                     }),
-                    html.Ul([
-                        html.Li(
-                            f"{row['EventName']} ({row['Casino']}) - {row['StartDate'].strftime('%b %d')} to {row['EndDate'].strftime('%b %d')}",
-                            style={'color': '#00008B', 'fontSize': font_sizes['overflow']}
-                        )
-                        for _, row in overflow_df.iterrows()
-                    ])
+                    #Filled in page by page when the box is opened
+                    html.Ul(id='overflow-list', style={
+                        'maxHeight': '360px',
+                        'overflowY': 'auto',
+                        'margin': '0'
+                    }),
+                    html.Div([
+                        html.Button("◀", id='overflow-prev-page', n_clicks=0, disabled=True, className='emoji-button'),
+                        html.Span(id='overflow-page-label', style={
+                            'color': '#6A5ACD',
+                            'fontSize': font_sizes['overflow']
+                        }),
+                        html.Button("▶", id='overflow-next-page', n_clicks=0, disabled=True, className='emoji-button'),
+                    ], style={
+                        'display': 'flex',
+                        'justifyContent': 'center',
+                        'alignItems': 'center',
+                        'gap': '12px',
+                        'marginTop': '6px'
+                    }),
+                    dcc.Store(id='overflow-page', data=0)
                 ],
                 style={
                     'backgroundColor': '#f5f3fa',
@@ -168,30 +333,80 @@ def register_callbacks(app):
             'marginBottom': '0'
         })
         
-        return html.Div([scrollable_content]), week_start.strftime('%Y-%m-%d')
+        return html.Div([scrollable_content]), {
+            'start': week_start.strftime('%Y-%m-%d'),
+            'weeks': n_weeks,
+            'casinos': list(casinos)
+        }
+
+    #Ongoing events for a rendered range, formatted once per version of those weeks
+    def build_ongoing_lines(week_start, n_weeks, store, casinos):
+        df, span_index = select_events(store, week_start, n_weeks, casinos)
+        overflow_df = get_ongoing_events(week_start, df, n_weeks, span_index)
+        return format_ongoing_lines(overflow_df)
 
     @app.callback(
         Output('overflow-box', 'className'),
         Output('overflow-toggle', 'children'),
+        Output('overflow-list', 'children'),
+        Output('overflow-page', 'data'),
+        Output('overflow-page-label', 'children'),
+        Output('overflow-prev-page', 'disabled'),
+        Output('overflow-next-page', 'disabled'),
         Input('overflow-toggle', 'n_clicks'),
+        Input('overflow-prev-page', 'n_clicks'),
+        Input('overflow-next-page', 'n_clicks'),
         State('overflow-date', 'data'),
+        State('overflow-page', 'data'),
+        State('screen-bucket', 'data'),
         prevent_initial_call=True
     )
 
-    def toggle_overflow(n_clicks, start_date_str):
-        start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
-        end_date = start_date + timedelta(days=6)
-        is_open = n_clicks % 2 == 1
+    def toggle_overflow(n_clicks, prev_clicks, next_clicks, overflow_range, page, screen_bucket):
+        start_date = PDT.localize(datetime.strptime(overflow_range['start'], '%Y-%m-%d'))
+        n_weeks = overflow_range['weeks']
+        end_date = start_date + timedelta(weeks=n_weeks, days=-1)
+
+        if ctx.triggered_id == 'overflow-toggle':
+            is_open = n_clicks % 2 == 1
+
+            box_class = 'overflow-box show' if is_open else 'overflow-box'
+
+            button_text = (
+                f"🌀 Hide Ongoing Events for {start_date.strftime('%b %d')} - {end_date.strftime('%b %d')}"
+                if is_open else 
+                f"🌀 Show Ongoing Events for {start_date.strftime('%b %d')} - {end_date.strftime('%b %d')}"
+            )
+
+            #Keep the current page visible while the box collapses
+            if not is_open:
+                return box_class, button_text, no_update, no_update, no_update, no_update, no_update
+            page = 0
+        else:
+            box_class = button_text = no_update
+            page += 1 if ctx.triggered_id == 'overflow-next-page' else -1
+
+        store = get_event_store()
+        casinos = tuple(overflow_range['casinos'])
+        key = ("ongoing", range_version(store, start_date, n_weeks), overflow_range['start'], n_weeks) + casinos
+        lines = get_or_render(key, build_ongoing_lines, start_date, n_weeks, store, casinos)
 
-        box_class = 'overflow-box show' if is_open else 'overflow-box'
+        n_pages = max(1, -(-len(lines) // OVERFLOW_PAGE_SIZE))
+        page = min(max(page, 0), n_pages - 1)
+        font_sizes, _ = get_dynamic_sizes(bucket_width(screen_bucket))
+        items = [
+            html.Li(line, style={'color': '#00008B', 'fontSize': font_sizes['overflow']})
+            for line in lines[page * OVERFLOW_PAGE_SIZE:(page + 1) * OVERFLOW_PAGE_SIZE]
+        ]
+        page_label = f"Page {page + 1} of {n_pages}" if n_pages > 1 else ""
 
-        button_text = (
-            f"🌀 Hide Ongoing Events for {start_date.strftime('%b %d')} - {end_date.strftime('%b %d')}"
-            if is_open else 
-            f"🌀 Show Ongoing Events for {start_date.strftime('%b %d')} - {end_date.strftime('%b %d')}"
-        )
+        return box_class, button_text, items, page, page_label, page == 0, page >= n_pages - 1
 
-        return box_class, button_text
+    #Day grid for one day, cached like the week charts
+    def build_day_view(day_start, store, screen_width, casinos):
+        events = query_events(store, day_start, shift_days(day_start, 1), casinos)
+        fig = build_day_figure(events, day_start, screen_width)
+        return build_day_header(day_start, screen_width, has_events=fig is not None), fig
 
     @app.callback(
         Output('event-modal', 'style'),
@@ -201,28 +416,34 @@ def register_callbacks(app):
         Output('weekly-graph', 'clickData'),
         Output('day-modal', 'style'),
         Output('day-modal', 'className'),
-        Output('day-modal-body', 'children'),
+        Output('day-modal-header', 'children'),
+        Output('day-event-catcher', 'figure'),
+        Output('day-event-catcher', 'style'),
         Input('weekly-graph', 'clickData'),
         Input("day-event-catcher", "clickData"),
         Input("close-modal", "n_clicks"),
         Input("close-timer", "n_intervals"),
         Input("close-day-modal", "n_clicks"),
         State('week-offset', 'data'),
-        State('screen-width', 'data'),
+        State('screen-bucket', 'data'),
+        State('casino-filter', 'data'),
+        State('near-filter', 'data'),
         prevent_initial_call=True
     )
-    def show_event_modal(weekly_click, day_click, close_clicks, timer_tick, close_day_clicks, week_offset, screen_width):
+    def show_event_modal(weekly_click, day_click, close_clicks, timer_tick, close_day_clicks, week_offset, screen_bucket, selected_casinos, near):
+        screen_width = bucket_width(screen_bucket)
         ctx = dash.callback_context
         click_reset = None
+        hidden = {'display': 'none'}
 
         if ctx.triggered_id == "close-timer":
-            return no_update, '', '', 0, click_reset, {'display': 'none'}, '', ''
+            return no_update, '', '', 0, click_reset, hidden, '', '', no_update, hidden
 
         if ctx.triggered_id == "close-modal":
-            return no_update, 'modal closing', no_update, 1, click_reset, no_update, no_update, no_update
+            return no_update, 'modal closing', no_update, 1, click_reset, no_update, no_update, no_update, no_update, no_update
         
         if ctx.triggered_id == "close-day-modal":
-            return no_update, no_update, no_update, no_update, click_reset, {'display': 'none'}, 'modal closing', ''
+            return no_update, no_update, no_update, no_update, click_reset, hidden, 'modal closing', '', no_update, hidden
         
         click_data = None 
         if ctx.triggered_id == "weekly-graph":
@@ -234,14 +455,28 @@ def register_callbacks(app):
         print("Triggered ID:", ctx.triggered_id)
             
         if not click_data or 'points' not in click_data or not click_data['points']:
-            return no_update, no_update, no_update, no_update, click_reset, no_update, no_update, no_update
+            return no_update, no_update, no_update, no_update, click_reset, no_update, no_update, no_update, no_update, no_update
         
         data = click_data['points'][0].get('customdata', [None])[0]
         if not data:
-            return no_update, no_update, no_update, no_update, click_reset, no_update, no_update, no_update
-        
-        
+            return no_update, no_update, no_update, no_update, click_reset, no_update, no_update, no_update, no_update, no_update
         
+        #Day click: the 4-week view sends its date, the single week only the weekday
+        if data.get("type") == "day_click":
+            if "date" in data:
+                day_start = PDT.localize(datetime.strptime(data["date"], '%Y-%m-%d'))
+            else:
+                week_start = week_start_for(week_offset)
+                day_start = shift_days(week_start, data["day_index"])
+
+            store = get_event_store()
+            casinos = filter_casinos(selected_casinos, near)
+            key = ("day", range_version(store, day_start), day_start.strftime('%Y-%m-%d'), screen_bucket) + casinos
+            header, fig = get_or_render(key, build_day_view, day_start, store, screen_width, casinos)
+            if fig is None:
+                return no_update, no_update, no_update, no_update, click_reset, {}, 'modal show', header, no_update, hidden
+            return no_update, no_update, no_update, no_update, click_reset, {}, 'modal show', header, fig, day_graph_style(screen_width)
+
         #Regular event click
         rows = []
         for label in ["EventName", "Casino", "Location", "StartDate", "EndDate", "Offer"]:
@@ -264,4 +499,4 @@ def register_callbacks(app):
                     html.Strong(f"{display_label}: ", style={'color': '#6A5ACD'}),
                     html.Span(value)
                 ], style={'marginBottom': '6px'}))
-        return {}, 'modal show', rows, 0, None, {'display': 'none'}, '', ''
\ No newline at end of file
+        return {}, 'modal show', rows, 0, None, hidden, '', '', no_update, hidden
\ No newline at end of file
@@ -0,0 +1,101 @@
+import threading
+import zlib
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+import numpy as np
+
+#Brand colors for the casinos we know
+CASINO_COLORS = MappingProxyType({
+    "ilani": {"bg": "#2c6f7f", "text": "#ffffff"},
+    "Spirit Mountain Casino": {"bg": "#a74321", "text": "#ffffff"},
+    "Lucky Eagle Casino": {"bg": "#862c8e", "text": "#ffffff"},
+    "Muckleshoot Casino": {"bg": "#1e1c29", "text": "#ffffff"},
+    "Little Creek Casino": {"bg": "#3086c3", "text": "#ffffff"},
+    "Red Wind Casino": {"bg": "#e13332", "text": "#ffffff"},
+    "Snoqualmie Casino": {"bg": "#00a9e0", "text": "#ffffff"},
+    "Angel of the Winds Casino": {"bg": "#64c7cc", "text": "#ffffff"},
+    "Lucky Dog Casino": {"bg": "#f07a22", "text": "#000000"},
+    "Legends Casino": {"bg": "#ca9a41", "text": "#000000"},
+    "Chinook Winds Casino": {"bg": "#32373d", "text": "#ffffff"},
+    "Emerald Queen Casino": {"bg": "#d62e52", "text": "#ffffff"},
+    "Rolling Hills Casino": {"bg": "#5b1d1e", "text": "#ffffff"},
+    "Wildhorse Casino": {"bg": "#d21245", "text": "#ffffff"},
+    "Tulalip Casino": {"bg": "#155e6d", "text": "#ffffff"},
+    "Quil Ceda Creek Casino": {"bg": "#9a0709", "text": "#ffffff"},
+    "Seven Feathers Casino": {"bg": "#41c5de", "text": "#000000"}
+})
+
+#Casinos without a brand color get one of these, picked by a stable hash of the name
+FALLBACK_PALETTE = (
+    "#ff0000", "#00ff00", "#0000ff", "#ffff00", "#ff00ff", "#00ffff", "#ff8000",
+    "#800000", "#008000", "#000080", "#800080", "#ffa500", "#808080", "#ff6347",
+    "#ff4500", "#008080", "#4b0082", "#008b8b", "#4682b4"
+)
+#Blocks whose casino is missing altogether
+DEFAULT_BLOCK_COLOR = "#aaa"
+DEFAULT_TEXT_COLOR = "#000000"
+
+def relative_luminance(hex_color):
+    hex_color = hex_color.lstrip("#")
+    if len(hex_color) == 3:
+        hex_color = "".join(c * 2 for c in hex_color)
+    channels = [int(hex_color[i:i + 2], 16) / 255 for i in (0, 2, 4)]
+    r, g, b = [c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4 for c in channels]
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+#Black or white, whichever contrasts more (WCAG ratio); one of them is always at least 4.5:1
+def contrast_text(bg):
+    luminance = relative_luminance(bg)
+    return "#000000" if (luminance + 0.05) / 0.05 >= 1.05 / (luminance + 0.05) else "#ffffff"
+
+#Same answer in every process and on every run, unlike hash()
+def casino_color(casino):
+    colors = CASINO_COLORS.get(casino)
+    if colors is not None:
+        return colors
+    bg = FALLBACK_PALETTE[zlib.crc32(str(casino).encode("utf-8")) % len(FALLBACK_PALETTE)]
+    return {"bg": bg, "text": contrast_text(bg)}
+
+#Casino code -> colors as parallel arrays; the extra last slot (code -1) is for rows with no casino
+class ColorTable(NamedTuple):
+    codes: Mapping[str, int]
+    bg: np.ndarray
+    text: np.ndarray
+
+def build_color_table(casinos):
+    names = list(dict.fromkeys(casinos))
+    colors = [casino_color(casino) for casino in names]
+    return ColorTable(
+        codes=MappingProxyType({casino: code for code, casino in enumerate(names)}),
+        bg=np.array([c["bg"] for c in colors] + [DEFAULT_BLOCK_COLOR], dtype=object),
+        text=np.array([c["text"] for c in colors] + [DEFAULT_TEXT_COLOR], dtype=object)
+    )
+
+_table = build_color_table(CASINO_COLORS)
+_table_lock = threading.Lock()
+
+#Table covering casinos; new names are resolved once and the grown table replaces the shared one
+def color_table(casinos=()):
+    global _table
+    table = _table
+    missing = [casino for casino in casinos if casino not in table.codes]
+    if not missing:
+        return table
+    with _table_lock:
+        _table = build_color_table(list(_table.codes) + sorted(set(missing) - set(_table.codes)))
+        return _table
+
+#(bg, text) arrays aligned with a Series of casino names, gathered by code
+def gather_colors(casinos):
+    table = color_table()
+    codes = casinos.map(table.codes)
+    unknown = codes.isna() & casinos.notna()
+    if unknown.any():
+        table = color_table(casinos[unknown].unique())
+        codes = casinos.map(table.codes)
+    codes = codes.fillna(-1).to_numpy(dtype=np.int64)
+    return table.bg[codes], table.text[codes]
+
+#Color map by Casino
+def get_color():
+    return CASINO_COLORS
@@ -1,15 +1,214 @@
+import os
+import threading
+import time
+from datetime import timedelta
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional
 import pandas as pd
-from .utils import PDT
-
-def load_event_data(csv_path="casino_events.csv"):
-    df = pd.read_csv(csv_path)
-    
-    for col in ["StartDate", "EndDate"]:
-        df[col] = pd.to_datetime(df[col], errors='coerce')
-        if df[col].dt.tz is None:
-            df[col] = df[col].dt.tz_localize(PDT)
+from .span_index import SpanIndex, build_span_index, extend_span_index, events_in_range
+from .storage import archive_path, get_backend, read_archive, write_archive
+from .recurrence import assign_series_ids, split_templates, get_occurrences, series_ends
+from .scheduler import week_start_for
+from .utils import MIN_WEEK_OFFSET, PDT, get_week_range
+
+#Copy-on-write (always on from pandas 3): frames derived from a store never write through to it
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+#In-memory backends carry the plain events and their span index; SQLite stores leave both to range SQL.
+#Recurring templates are kept apart and expanded per requested window.
+#base_version names the last full load; week_appends counts rows appended since then per week (Sunday date),
+#so cached weeks and days nothing was appended to stay valid.
+#In memory, df is the hot tier: events still ending after hot_from, the start of the navigable window.
+#The archived rows that ended earlier live in the cold tier file at archive, keeping their row labels.
+#A store is an immutable snapshot shared by every thread: changes build a new store, and nothing that reads
+#one (queries, plotting, payloads) modifies its frames, index arrays or mappings.
+class EventStore(NamedTuple):
+    version: str
+    df: Optional[pd.DataFrame]
+    span_index: Optional[SpanIndex]
+    templates: pd.DataFrame
+    backend: object
+    base_version: str
+    week_appends: Mapping[str, int]
+    series_ids: Mapping[str, int]
+    hot_from: Optional[pd.Timestamp] = None
+    archive: Optional[str] = None
+    archived: int = 0
+
+EMPTY_MAPPING = MappingProxyType({})
+
+_stores = {}
+_store_lock = threading.Lock()
+
+#Oldest week navigation can reach; anything that ended before it is only needed by search and export
+def hot_window_start():
+    return pd.Timestamp(week_start_for(MIN_WEEK_OFFSET))
+
+def archive_missing(store):
+    return store.archive is not None and not os.path.exists(store.archive)
+
+#Moves events that ended before hot_from out of memory and into the cold archive.
+#If the archive is gone (pruned while this worker sat idle), the store is rebuilt from the backend.
+def demote_events(store, hot_from):
+    if archive_missing(store):
+        return load_store(store.backend, store.version)
+    if store.df is None or (store.hot_from is not None and hot_from <= store.hot_from):
+        return store
+
+    cold = ~(store.df["EndDate"] > hot_from)
+    if not cold.any():
+        return store._replace(hot_from=hot_from)
+
+    demoted = store.df[cold]
+    if store.archive is not None:
+        demoted = pd.concat([read_archive(store.archive), demoted]).sort_index()
+    path = write_archive(demoted, archive_path(store.backend.path, store.base_version, hot_from))
+
+    hot = store.df[~cold]
+    return store._replace(df=hot, span_index=build_span_index(hot), hot_from=hot_from, archive=str(path), archived=len(demoted))
+
+def load_store(backend, version):
+    if backend.supports_range_queries:
+        return EventStore(version, None, None, backend.load_templates(), backend, version, EMPTY_MAPPING, EMPTY_MAPPING)
+    series_ids = {}
+    df, templates = split_templates(assign_series_ids(backend.load(), series_ids))
+    store = EventStore(version, df, None, templates, backend, version, EMPTY_MAPPING, MappingProxyType(series_ids))
+    store = demote_events(store, hot_window_start())
+    return store if store.span_index is not None else store._replace(span_index=build_span_index(df))
+
+#Sunday dates of the weeks an event touches
+def event_weeks(start, end):
+    week = get_week_range(start.astimezone(PDT))[0].date()
+    last = max(end - timedelta(microseconds=1), start).astimezone(PDT).date()
+    while week <= last:
+        yield week.strftime('%Y-%m-%d')
+        week += timedelta(weeks=1)
+
+#Folds appended rows into the store: only the delta is parsed, the span index is merged rather than rebuilt
+def append_events(store, appended, version):
+    next_label = len(store.df) + len(store.templates) + store.archived
+    appended = appended.set_axis(range(next_label, next_label + len(appended)))
+    series_ids = dict(store.series_ids)
+    appended = assign_series_ids(appended, series_ids)
+
+    week_appends = dict(store.week_appends)
+    for start, end in zip(appended["StartDate"], appended["EndDate"]):
+        if pd.notna(start) and pd.notna(end):
+            for week in event_weeks(start, end):
+                week_appends[week] = week_appends.get(week, 0) + 1
+
+    return store._replace(
+        version=version,
+        df=pd.concat([store.df, appended]),
+        span_index=extend_span_index(store.span_index, appended, len(store.df)),
+        week_appends=MappingProxyType(week_appends),
+        series_ids=MappingProxyType(series_ids)
+    )
+
+#Events for the current data version of the configured backend.
+#Appends to a CSV are folded in; any other change reloads everything.
+#When the window advances past a week, its finished events are demoted to the cold tier.
+def get_event_store(source=None):
+    if _frames:
+        expire_frames()
+    backend = get_backend(source)
+    version = backend.version()
+    store = _stores.get(backend.path)
+    if (store is not None and store.version == version and (store.hot_from is None or store.hot_from >= hot_window_start())
+            and not archive_missing(store)):
+        return store
+
+    with _store_lock:
+        store = _stores.get(backend.path)
+        if store is not None and store.version == version:
+            store = demote_events(store, hot_window_start())
+            _stores[backend.path] = store
         else:
-            df[col] = df[col].dt.tz_convert(PDT)
-            
-    return df
-    
\ No newline at end of file
+            appended = None
+            if store is not None and hasattr(backend, "read_appended"):
+                appended = backend.read_appended()
+            #New templates would change occurrences everywhere, so they take the full reload
+            if appended is not None and split_templates(appended)[1].empty:
+                store = append_events(store, appended, version)
+            else:
+                store = load_store(backend, version)
+            _stores[backend.path] = store
+    return store
+
+#Cache version for a range of whole weeks: unchanged until a row touching one of those weeks is appended
+def range_version(store, range_start, n_weeks=1):
+    week = get_week_range(range_start)[0].date()
+    counts = [store.week_appends.get((week + timedelta(weeks=i)).strftime('%Y-%m-%d'), 0) for i in range(n_weeks)]
+    if not any(counts):
+        return store.base_version
+    return store.base_version + "+" + ".".join(map(str, counts))
+
+#Adds the recurring occurrences that fall in the window
+def with_occurrences(store, events, range_start, range_end, casinos=None):
+    if store.templates.empty:
+        return events
+    occurrences = get_occurrences(store.base_version, store.templates, range_start, range_end)
+    if casinos:
+        occurrences = occurrences[occurrences["Casino"].isin(casinos)]
+    return pd.concat([events, occurrences])
+
+#Events overlapping [range_start, range_end): pushed down to the backend when it can answer ranges.
+#Ranges reaching back before the hot window also scan the cold archive.
+def query_events(store, range_start, range_end, casinos=None):
+    if store.df is None:
+        events = store.backend.query_range(range_start, range_end, casinos)
+    else:
+        events = events_in_range(store.df, range_start, range_end, store.span_index)
+        if store.archive is not None and range_start < store.hot_from:
+            cold = events_in_range(read_archive(store.archive), range_start, range_end)
+            events = pd.concat([cold, events]).sort_index()
+        if casinos:
+            events = events[events["Casino"].isin(casinos)]
+    return with_occurrences(store, events, range_start, range_end, casinos)
+
+#Span index where each template covers its whole series, not just its first occurrence
+def build_series_span_index(df):
+    _, templates = split_templates(df)
+    if templates.empty:
+        return build_span_index(df)
+    ends = df["EndDate"].copy()
+    ends.loc[templates.index] = series_ends(templates)
+    return build_span_index(df.assign(EndDate=ends))
+
+#version -> (frame, span index, last used); dropped once unused for FRAME_KEEP_SECONDS, so one search or
+#export doesn't keep the cold archive (or a whole SQLite table) in the worker for good
+_frames = {}
+FRAME_KEEP_SECONDS = int(os.environ.get("FRAME_KEEP_SECONDS", "300"))
+
+def expire_frames(now=None):
+    now = time.monotonic() if now is None else now
+    for version, (_, _, used) in list(_frames.items()):
+        if now - used > FRAME_KEEP_SECONDS:
+            _frames.pop(version, None)
+
+#Whole table (templates as one row per series, cold tier included) plus span index for table-wide
+#consumers (search, API, export); built on first use, so calendar-only workers never load the archive
+def get_indexed_frame(store):
+    if store.df is not None and store.templates.empty and store.archive is None:
+        return store.df, store.span_index
+
+    frame = _frames.get(store.version)
+    if frame is None:
+        with _store_lock:
+            frame = _frames.get(store.version)
+            if frame is None:
+                if store.df is None:
+                    df = store.backend.load()
+                else:
+                    cold = [] if store.archive is None else [read_archive(store.archive)]
+                    df = pd.concat([store.df, store.templates] + cold).sort_index()
+                frame = (df, build_series_span_index(df), time.monotonic())
+                _frames.clear()
+    _frames[store.version] = frame[:2] + (time.monotonic(),)
+    return frame[:2]
+
+def get_active_casinos(store):
+    if store.df is None:
+        return set(store.backend.casinos())
+    return set(store.df['Casino'].dropna().unique()) | set(store.templates['Casino'].dropna().unique())
@@ -0,0 +1,132 @@
+import hashlib
+import json
+from datetime import datetime
+import pandas as pd
+import pytz
+from .data import get_indexed_frame
+from .recurrence import parse_rrule, format_rrule
+from .search import search_events
+
+EXPORT_BATCH_SIZE = 500
+ICS_LINE_OCTETS = 75
+EXPORT_COLUMNS = ["EventName", "Casino", "Location", "Offer"]
+
+ICS_HEADER = [
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//Casino Calendar//Events//EN",
+    "CALSCALE:GREGORIAN",
+    "X-WR-CALNAME:Casino Events",
+    "X-WR-TIMEZONE:America/Los_Angeles",
+    #US rules since 2007, enough for clients that don't know the zone by name
+    "BEGIN:VTIMEZONE",
+    "TZID:America/Los_Angeles",
+    "BEGIN:DAYLIGHT",
+    "TZOFFSETFROM:-0800",
+    "TZOFFSETTO:-0700",
+    "TZNAME:PDT",
+    "DTSTART:20070311T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU",
+    "END:DAYLIGHT",
+    "BEGIN:STANDARD",
+    "TZOFFSETFROM:-0700",
+    "TZOFFSETTO:-0800",
+    "TZNAME:PST",
+    "DTSTART:20071104T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU",
+    "END:STANDARD",
+    "END:VTIMEZONE"
+]
+
+#Row positions (templates count once, as their whole series) matching the export filter
+def export_positions(store, start=None, end=None, casinos=None):
+    return search_events(store, casinos=casinos, start=start, end=end)
+
+#Frames of at most EXPORT_BATCH_SIZE rows, so an export never formats the whole table at once
+def export_batches(store, positions):
+    df = get_indexed_frame(store)[0]
+    for i in range(0, len(positions), EXPORT_BATCH_SIZE):
+        yield df.iloc[positions[i:i + EXPORT_BATCH_SIZE]]
+
+def ics_escape(series):
+    return (
+        series.fillna("").astype(str)
+        .str.replace("\\", "\\\\", regex=False)
+        .str.replace(";", "\\;", regex=False)
+        .str.replace(",", "\\,", regex=False)
+        .str.replace("\r\n", "\\n", regex=False)
+        .str.replace("\n", "\\n", regex=False)
+    )
+
+#Content lines are limited to 75 octets; continuations start with a space
+def ics_fold(line):
+    data = line.encode("utf-8")
+    if len(data) <= ICS_LINE_OCTETS:
+        return line + "\r\n"
+    parts = []
+    while data:
+        limit = ICS_LINE_OCTETS if not parts else ICS_LINE_OCTETS - 1
+        cut = min(limit, len(data))
+        #Never split a multi-byte character
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+    return "\r\n ".join(parts) + "\r\n"
+
+#RFC 5545 wants UNTIL in UTC when DTSTART carries a TZID
+def ics_rrule(rule):
+    recurrence = parse_rrule(rule)
+    if recurrence.until is None:
+        return format_rrule(recurrence)
+    return format_rrule(recurrence._replace(until=None)) + ";UNTIL=" + recurrence.until.astimezone(pytz.UTC).strftime("%Y%m%dT%H%M%SZ")
+
+#Stable across data versions, so calendar clients update events instead of duplicating them
+def event_uids(df):
+    keys = df["EventName"].fillna("") + "|" + df["Casino"].fillna("") + "|" + df["StartDate"].dt.strftime("%Y%m%dT%H%M")
+    return [hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + "@casino-calendar" for key in keys]
+
+def ics_chunks(store, start=None, end=None, casinos=None):
+    yield "".join(ics_fold(line) for line in ICS_HEADER)
+    stamp = datetime.now(pytz.UTC).strftime("%Y%m%dT%H%M%SZ")
+
+    for batch in export_batches(store, export_positions(store, start, end, casinos)):
+        rrules = batch["RRule"] if "RRule" in batch.columns else pd.Series(None, index=batch.index, dtype=object)
+        lines = []
+        for uid, dtstart, dtend, name, casino, location, offer, rrule in zip(
+            event_uids(batch),
+            batch["StartDate"].dt.strftime("%Y%m%dT%H%M%S"),
+            batch["EndDate"].dt.strftime("%Y%m%dT%H%M%S"),
+            ics_escape(batch["EventName"]),
+            ics_escape(batch["Casino"]),
+            ics_escape(batch["Location"]),
+            ics_escape(batch["Offer"]),
+            rrules
+        ):
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:{uid}",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART;TZID=America/Los_Angeles:{dtstart}",
+                f"DTEND;TZID=America/Los_Angeles:{dtend}",
+                f"SUMMARY:{name} ({casino})",
+                f"LOCATION:{location}",
+                f"DESCRIPTION:{offer}"
+            ]
+            if isinstance(rrule, str):
+                lines.append(f"RRULE:{ics_rrule(rrule)}")
+            lines.append("END:VEVENT")
+        yield "".join(ics_fold(line) for line in lines)
+
+    yield ics_fold("END:VCALENDAR")
+
+#One JSON object per line; ids match /api/search row ids for the same data version
+def ndjson_chunks(store, start=None, end=None, casinos=None):
+    for batch in export_batches(store, export_positions(store, start, end, casinos)):
+        records = batch[EXPORT_COLUMNS].astype(object).where(batch[EXPORT_COLUMNS].notna(), None)
+        records.insert(0, "id", batch.index)
+        records["StartDate"] = batch["StartDate"].dt.strftime("%Y-%m-%dT%H:%M:%S%z")
+        records["EndDate"] = batch["EndDate"].dt.strftime("%Y-%m-%dT%H:%M:%S%z")
+        if "RRule" in batch.columns:
+            records["RRule"] = batch["RRule"].astype(object).where(batch["RRule"].notna(), None)
+        yield "".join(json.dumps(record) + "\n" for record in records.to_dict("records"))
@@ -0,0 +1,106 @@
+import math
+from typing import NamedTuple, Tuple
+
+EARTH_RADIUS_MI = 3958.8
+#Choices offered by the "near me" control, in miles
+NEAR_RADII = (25, 50, 100, 200)
+#Matches no casino, so an empty radius result still filters instead of meaning "all casinos"
+NO_CASINOS = ("",)
+
+#Bundled geocodes (lat, lon) for the casinos in get_color, so distance filters never call a geocoder
+CASINO_COORDINATES = {
+    "ilani": (45.8663, -122.7190),
+    "Spirit Mountain Casino": (45.0630, -123.6115),
+    "Lucky Eagle Casino": (46.8222, -123.0810),
+    "Muckleshoot Casino": (47.2846, -122.2183),
+    "Little Creek Casino": (47.1222, -123.1617),
+    "Red Wind Casino": (46.9879, -122.7226),
+    "Snoqualmie Casino": (47.5139, -121.8455),
+    "Angel of the Winds Casino": (48.1743, -122.1178),
+    "Lucky Dog Casino": (47.3236, -123.1601),
+    "Legends Casino": (46.3882, -120.3162),
+    "Chinook Winds Casino": (44.9868, -124.0117),
+    "Emerald Queen Casino": (47.2361, -122.4098),
+    "Rolling Hills Casino": (39.9203, -122.1985),
+    "Wildhorse Casino": (45.6635, -118.6825),
+    "Tulalip Casino": (48.0885, -122.1885),
+    "Quil Ceda Creek Casino": (48.0612, -122.1873),
+    "Seven Feathers Casino": (42.9316, -123.2823)
+}
+
+#Points on the unit sphere: straight-line (chord) distance orders the same as distance along the surface
+def unit_vector(lat, lon):
+    lat, lon = math.radians(lat), math.radians(lon)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+def chord_length(miles):
+    return 2 * math.sin(min(miles / EARTH_RADIUS_MI, math.pi) / 2)
+
+def surface_miles(chord):
+    return 2 * EARTH_RADIUS_MI * math.asin(min(chord / 2, 1.0))
+
+#Balanced KD-tree laid out implicitly: the node for [lo, hi) sits at (lo + hi) // 2,
+#splitting on axes[mid] with smaller coordinates to its left
+class KdTree(NamedTuple):
+    points: Tuple[Tuple[float, float, float], ...]
+    names: Tuple[str, ...]
+    axes: Tuple[int, ...]
+
+def build_kd_tree(coordinates):
+    items = [(name, unit_vector(lat, lon)) for name, (lat, lon) in coordinates.items()]
+    slots = [None] * len(items)
+
+    def place(group, lo, hi):
+        if not group:
+            return
+        spreads = [max(p[axis] for _, p in group) - min(p[axis] for _, p in group) for axis in range(3)]
+        axis = spreads.index(max(spreads))
+        group = sorted(group, key=lambda item: item[1][axis])
+        mid = (lo + hi) // 2
+        slots[mid] = (group[mid - lo], axis)
+        place(group[:mid - lo], lo, mid)
+        place(group[mid - lo + 1:], mid + 1, hi)
+
+    place(items, 0, len(items))
+    return KdTree(
+        points=tuple(item[1] for item, _ in slots),
+        names=tuple(item[0] for item, _ in slots),
+        axes=tuple(axis for _, axis in slots)
+    )
+
+#(name, chord distance) for every point within radius of point, nearest first
+def query_radius(tree, point, radius):
+    hits = []
+    stack = [(0, len(tree.names))]
+    while stack:
+        lo, hi = stack.pop()
+        if lo >= hi:
+            continue
+        mid = (lo + hi) // 2
+        node = tree.points[mid]
+        dist = math.dist(point, node)
+        if dist <= radius:
+            hits.append((tree.names[mid], dist))
+        diff = point[tree.axes[mid]] - node[tree.axes[mid]]
+        if diff <= radius:
+            stack.append((lo, mid))
+        if diff >= -radius:
+            stack.append((mid + 1, hi))
+    return sorted(hits, key=lambda hit: hit[1])
+
+CASINO_TREE = build_kd_tree(CASINO_COORDINATES)
+
+#(casino, miles) within radius_mi of (lat, lon), nearest first
+def casinos_near(lat, lon, radius_mi):
+    hits = query_radius(CASINO_TREE, unit_vector(lat, lon), chord_length(radius_mi))
+    return [(name, surface_miles(chord)) for name, chord in hits]
+
+#Casino filter narrowed to the casinos within a radius; near is {"lat", "lon", "radius"} or None
+def filter_casinos(selected, near=None):
+    casinos = tuple(sorted(selected or []))
+    if not near:
+        return casinos
+    nearby = {name for name, _ in casinos_near(near["lat"], near["lon"], near["radius"])}
+    if casinos:
+        nearby &= set(casinos)
+    return tuple(sorted(nearby)) or NO_CASINOS
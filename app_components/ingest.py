@@ -0,0 +1,105 @@
+import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import pandas as pd
+from .plotting import get_color
+from .storage import DATE_FORMAT, format_event_dates, write_events
+from .utils import PDT
+
+INGEST_CHUNK_SIZE = 50000
+DEDUPE_COLUMNS = ["EventName", "Casino", "StartDate"]
+REPORT_COLUMNS = ["source", "line", "reason"]
+
+#Parse and validate one raw chunk; returns (clean rows, rejected raw rows with a reason)
+def clean_chunk(chunk, source, known_casinos, date_format=DATE_FORMAT):
+    parsed = chunk.copy()
+    for col in ["StartDate", "EndDate"]:
+        #Explicit format keeps parsing on the vectorized path; anything else is an error, not a guess
+        parsed[col] = pd.to_datetime(chunk[col], format=date_format, errors="coerce").dt.tz_localize(
+            PDT, ambiguous="NaT", nonexistent="NaT")
+
+    #First failing check wins, so each reject carries one reason
+    reasons = pd.Series(None, index=chunk.index, dtype=object)
+    checks = [
+        ("StartDate not in " + date_format, parsed["StartDate"].isna()),
+        ("EndDate not in " + date_format, parsed["EndDate"].isna()),
+        #Zero-length rows are real: prize drawings at a single instant
+        ("EndDate before StartDate", parsed["EndDate"] < parsed["StartDate"]),
+        ("unknown casino", ~chunk["Casino"].isin(known_casinos))
+    ]
+    for reason, failed in checks:
+        reasons = reasons.mask(failed & reasons.isna(), reason)
+
+    #Header is line 1 and read_csv keeps numbering rows across chunks
+    lines = chunk.index + 2
+    rejected = reasons.notna()
+    rejects = chunk[rejected].assign(source=source, line=lines[rejected], reason=reasons[rejected])
+    return parsed[~rejected].assign(source=source, line=lines[~rejected]), rejects
+
+def read_chunks(paths, chunksize):
+    for path in paths:
+        for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str):
+            yield str(path), chunk
+
+#Cleans chunks across processes, keeping at most a few in flight and yielding results in input order
+def clean_chunks(paths, chunksize=INGEST_CHUNK_SIZE, workers=None):
+    known_casinos = frozenset(get_color())
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for source, chunk in read_chunks(paths, chunksize):
+            yield clean_chunk(chunk, source, known_casinos)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for source, chunk in read_chunks(paths, chunksize):
+            pending.append(pool.submit(clean_chunk, chunk, source, known_casinos))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+#Clean every feed into one store (.db for SQLite, else CSV) plus a rejects report
+def ingest(paths, out_path, rejects_path, chunksize=INGEST_CHUNK_SIZE, workers=None):
+    clean = []
+    rejects = []
+    for events, rejected in clean_chunks(paths, chunksize, workers):
+        clean.append(events)
+        rejects.append(rejected)
+
+    events = pd.concat(clean, ignore_index=True)
+    #Earlier feeds and rows win over later copies of the same event
+    duplicated = events.duplicated(DEDUPE_COLUMNS)
+    rejects.append(format_event_dates(events[duplicated]).assign(reason="duplicate"))
+    events = events[~duplicated].drop(columns=["source", "line"])
+    events = events.sort_values("StartDate", kind="stable").reset_index(drop=True)
+
+    if Path(out_path).suffix.lower() in (".db", ".sqlite", ".sqlite3"):
+        write_events([events], out_path)
+    else:
+        format_event_dates(events).to_csv(out_path, index=False)
+
+    report = pd.concat(rejects, ignore_index=True)
+    report = report[REPORT_COLUMNS + [col for col in report.columns if col not in REPORT_COLUMNS]]
+    report.to_csv(rejects_path, index=False)
+    return len(events), report["reason"].value_counts()
+
+#python -m app_components.ingest feeds/*.csv --out casino_events.csv --rejects rejects.csv
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate, dedupe and merge event CSV feeds")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--out", default="casino_events.csv")
+    parser.add_argument("--rejects", default="rejects.csv")
+    parser.add_argument("--chunksize", type=int, default=INGEST_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    written, reasons = ingest(args.paths, args.out, args.rejects, args.chunksize, args.workers)
+    print(f"Wrote {written} events to {args.out}; {reasons.sum()} rejected (see {args.rejects})")
+    for reason, count in reasons.items():
+        print(f"  {count:6d}  {reason}")
+
+if __name__ == "__main__":
+    main()
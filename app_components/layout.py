@@ -1,7 +1,12 @@
+import threading
 from dash import html, dcc
-from .utils import get_dynamic_sizes
-from .data import load_event_data
-from .plotting import get_color
+from .utils import get_dynamic_sizes, get_breakpoint
+from .plotting import build_empty_figure
+from .colors import casino_color, get_color
+from .data import get_active_casinos
+from .geo import NEAR_RADII
+
+HEADER_CACHE_SIZE = 64
 
 def create_layout(app): 
     screen_width = 1024
@@ -14,14 +19,46 @@ def create_layout(app):
         'paddingBottom': '40px'
     },
     children=[
-        #Sticky-Header container
+        #Sticky-Header container: cached title/navigation/legend, plus the per-week label
         html.Div(id='sticky-header', style={
             'position': 'sticky',
             'top': 0,
             'padding': f"{padding_sizes['header_padding']} 0",
             'backgroundColor': 'white',
             'zIndex': 1000
-        }),
+        }, children=[
+            html.Div(id='sticky-header-content'),
+            html.Div(id='week-label', style=week_label_style(font_sizes, padding_sizes))
+        ]),
+        
+        #Week / rolling 4-week view toggle
+        html.Button(
+            "📆 Show 4 Weeks",
+            id='view-toggle',
+            n_clicks=0,
+            style={
+                'color': '#00008B',
+                'fontSize': font_sizes['overflow'],
+                'padding': '2px 4px',
+                'display': 'block',
+                'margin': f"{padding_sizes['xxs']} auto 0"
+            }
+        ),
+
+        #Radius filter around the browser's location
+        html.Div(
+            dcc.Dropdown(
+                id='near-radius',
+                options=[{'label': f"📍 Within {miles} mi", 'value': miles} for miles in NEAR_RADII],
+                placeholder="📍 Casinos near me",
+                searchable=False
+            ),
+            style={
+                'width': '220px',
+                'fontSize': font_sizes['overflow'],
+                'margin': f"{padding_sizes['xxs']} auto 0"
+            }
+        ),
         
         #Loading spinner and calendar weeks
         dcc.Loading(
@@ -39,9 +76,13 @@ def create_layout(app):
         ),
         
         #State Stores and Timers
-        dcc.Store(id='screen-width', data=1024), 
+        dcc.Store(id='screen-bucket', data=get_breakpoint(screen_width)),
         dcc.Store(id='week-offset', data=0),
+        dcc.Store(id='view-mode', data='week'),
+        dcc.Store(id='casino-filter', data=[]),
+        dcc.Store(id='near-filter', data=None),
         dcc.Store(id='overflow-date'),
+        dcc.Store(id='chart-request'),
         dcc.Interval(id='initial-trigger', interval=1, max_intervals=1),
         dcc.Interval(id='close-timer', interval=600, n_intervals=0, max_intervals=0),
      
@@ -71,11 +112,20 @@ def create_layout(app):
         #Day-Modal Popup for day's events
         html.Div(id='day-modal', className='modal', children=[
             html.Div(id='day-modal-content', className='modal-content', children=[
+                #The day graph always exists so the modal callback's click Input is never missing
                 html.Div(id='day-modal-body', style={
                     "maxHeight": "80vh",
                     "overflowY": "scroll",
                     "padding": "10px"
-                }),
+                }, children=[
+                    html.Div(id='day-modal-header'),
+                    dcc.Graph(
+                        id='day-event-catcher',
+                        figure=build_empty_figure(title=""),
+                        config={'displayModeBar': False},
+                        style={'display': 'none'}
+                    )
+                ]),
                 html.Button("Close", id="close-day-modal", style={
                     'marginTop': '10px',
                     'display': 'block',
@@ -93,9 +143,49 @@ def create_layout(app):
     ]
     )
     
-def sticky_header(screen_width, week_start_label=""):
+def week_label_style(font_sizes, padding_sizes):
+    return {
+        'fontSize': font_sizes['legend_title'],
+        'color': '#00008B',
+        'textAlign': 'center',
+        'fontWeight': 'bold',
+        'padding': f"{padding_sizes.get('xxs', '6px')} 0",
+        'backgroundColor': 'white',
+        'boxShadow': '0 -2px 4px rgba(0,0,0,0.25)',
+        'zIndex': 900
+    }
+
+#Active casinos and their colors, computed once per data version
+_legend_entries = {}
+
+def get_legend_entries(store):
+    entries = _legend_entries.get(store.version)
+    if entries is None:
+        active = get_active_casinos(store)
+        entries = [(casino, color) for casino, color in get_color().items() if casino in active]
+        #Casinos without a brand color follow, in their fallback palette colors
+        entries += [(casino, casino_color(casino)) for casino in sorted(active - set(get_color()))]
+        _legend_entries.clear()
+        _legend_entries[store.version] = entries
+    return entries
+
+_header_cache = {}
+_header_lock = threading.Lock()
+
+#Header trees are reused across requests; only a breakpoint, data or filter change builds a new one
+def get_sticky_header(store, screen_width, selected_casinos=None):
+    key = (store.version, get_breakpoint(screen_width), tuple(sorted(selected_casinos or [])))
+    header = _header_cache.get(key)
+    if header is None:
+        header = sticky_header(screen_width, get_legend_entries(store), selected_casinos)
+        with _header_lock:
+            if len(_header_cache) >= HEADER_CACHE_SIZE:
+                _header_cache.clear()
+            _header_cache[key] = header
+    return header
+
+def sticky_header(screen_width, legend_entries, selected_casinos=None):
     font_sizes, padding_sizes = get_dynamic_sizes(screen_width)
-    df = load_event_data()
 
     return html.Div([
         html.H1(
@@ -132,7 +222,7 @@ def sticky_header(screen_width, week_start_label=""):
                     }
                 ),
                 html.Div(
-                    create_legend(font_sizes, padding_sizes, df),
+                    create_legend(font_sizes, padding_sizes, legend_entries, selected_casinos),
                     style={
                         'display': 'flex',
                         'flexWrap': 'wrap',
@@ -158,46 +248,39 @@ def sticky_header(screen_width, week_start_label=""):
             'paddingBottom': '10px',
         }
         ),
-        html.Div(week_start_label, style={
-            'fontSize': font_sizes['legend_title'],
-            'color': '#00008B',
-            'textAlign': 'center',
-            'fontWeight': 'bold',
-            'padding': f"{padding_sizes.get('xxs', '6px')} 0",
-            'backgroundColor': 'white',
-            'boxShadow': '0 -2px 4px rgba(0,0,0,0.25)',
-            'zIndex': 900
-        }),
     ]
 )
 
-def create_legend(font_sizes, padding_sizes, df):
-    df = load_event_data()
+#Legend entries double as casino filter chips; unselected casinos are dimmed while a filter is active
+def legend_chip_class(casino, selected_casinos):
+    return 'casino-chip' if not selected_casinos or casino in selected_casinos else 'casino-chip inactive'
+
+def create_legend(font_sizes, padding_sizes, legend_entries, selected_casinos=None):
     legend_items = []
-    for casino, color in get_color().items():
-        if casino in df['Casino'].unique():
-            legend_items.append(html.Div([
-                html.Div(
-                    style={
-                        'backgroundColor': color["bg"],
-                        'width': '20px',
-                        'height': '20px',
-                        'display': 'inline-block',
-                        'marginRight': '6px'
-                    }
-                ),
-                html.Span(
-                    f"{casino}",
-                    style={
-                        'color': color["bg"],
-                        'marginRight': '4px',
-                        'fontSize': font_sizes['legend']
-                    }
-                )
-            ], style={
-                'display': 'flex',
-                'alignItems': 'center',
-                'margin': f"0 {padding_sizes['legend_gap']} {padding_sizes['legend_gap']} 0",
-                'flex': '0 1 auto',
-            }))
+    for casino, color in legend_entries:
+        legend_items.append(html.Div(id={'type': 'casino-chip', 'casino': casino}, n_clicks=0, className=legend_chip_class(casino, selected_casinos), children=[
+            html.Div(
+                style={
+                    'backgroundColor': color["bg"],
+                    'width': '20px',
+                    'height': '20px',
+                    'display': 'inline-block',
+                    'marginRight': '6px'
+                }
+            ),
+            html.Span(
+                f"{casino}",
+                style={
+                    'color': color["bg"],
+                    'marginRight': '4px',
+                    'fontSize': font_sizes['legend']
+                }
+            )
+        ], style={
+            'display': 'flex',
+            'alignItems': 'center',
+            'margin': f"0 {padding_sizes['legend_gap']} {padding_sizes['legend_gap']} 0",
+            'flex': '0 1 auto',
+            'cursor': 'pointer',
+        }))
     return legend_items
\ No newline at end of file
@@ -0,0 +1,394 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+import psutil
+import requests
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BOOT_TIMEOUT = 60
+REQUEST_TIMEOUT = 120
+#Clients reuse connections; with gunicorn's 2s default a saturated box closes them just as the next request goes out
+KEEP_ALIVE = 30
+SAMPLE_INTERVAL = 0.5
+#Screen-bucket mix of a session: mostly phones and desktops
+BUCKET_WEIGHTS = (20, 10, 5, 15, 25, 25)
+PERCENTILES = (50, 90, 95, 99)
+
+class Timing(NamedTuple):
+    action: str
+    seconds: float
+    error: str
+
+#gunicorn app:server on a local port with a fresh render cache and archive, so runs start from the same state
+def boot_server(port, workers, worker_class, threads, env_overrides, state_dir, log):
+    env = dict(os.environ, WEEK_SCHEDULER="0")
+    if state_dir is not None:
+        env.update(RENDER_CACHE_DIR=os.path.join(state_dir, "render_cache"), EVENT_ARCHIVE_DIR=os.path.join(state_dir, "event_archive"))
+    env.update(env_overrides)
+    cmd = [
+        sys.executable, "-m", "gunicorn", "app:server",
+        "--bind", f"127.0.0.1:{port}",
+        "--workers", str(workers),
+        "--worker-class", worker_class,
+        "--timeout", str(REQUEST_TIMEOUT),
+        "--keep-alive", str(KEEP_ALIVE)
+    ]
+    #gunicorn quietly swaps sync workers for gthread when given more than one thread
+    if worker_class == "gthread":
+        cmd += ["--threads", str(threads)]
+    server = subprocess.Popen(cmd, cwd=REPO_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + BOOT_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup; rerun with --server-log to see why")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/_dash-layout", timeout=5).ok:
+                return server
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError(f"gunicorn did not answer within {BOOT_TIMEOUT}s")
+
+def stop_server(server):
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+#Per-worker CPU seconds and RSS, sampled from the gunicorn master's process tree.
+#Background-callback job processes are counted against the worker that spawned them.
+class ResourceSampler:
+    def __init__(self, master_pid):
+        self.master = psutil.Process(master_pid)
+        self.first_cpu = {}
+        self.last_cpu = {}
+        self.rss = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="loadtest-sampler", daemon=True)
+
+    def sample(self):
+        try:
+            workers = self.master.children()
+        except psutil.NoSuchProcess:
+            return
+        for worker in workers:
+            try:
+                procs = [worker] + worker.children(recursive=True)
+                cpu = 0.0
+                rss = 0
+                for proc in procs:
+                    times = proc.cpu_times()
+                    cpu += times.user + times.system
+                    rss += proc.memory_info().rss
+            except psutil.NoSuchProcess:
+                continue
+            self.first_cpu.setdefault(worker.pid, cpu)
+            self.last_cpu[worker.pid] = cpu
+            self.rss.setdefault(worker.pid, []).append(rss)
+
+    def _run(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+    def start(self):
+        self.sample()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+    def summary(self, wall_seconds):
+        return [
+            {
+                "pid": pid,
+                "cpu_seconds": round(self.last_cpu[pid] - self.first_cpu[pid], 2),
+                "cpu_percent": round(100 * (self.last_cpu[pid] - self.first_cpu[pid]) / wall_seconds, 1),
+                "rss_mean_mb": round(sum(samples) / len(samples) / 2**20, 1),
+                "rss_max_mb": round(max(samples) / 2**20, 1)
+            }
+            for pid, samples in sorted(self.rss.items())
+        ]
+
+#Outputs as the renderer posts them: allow_duplicate outputs carry an "@hash" suffix that isn't part of the prop
+def split_outputs(output):
+    def split(part):
+        component, prop = part.rsplit(".", 1)
+        return {"id": component, "property": prop.split("@")[0]}
+    if not output.startswith(".."):
+        return split(output)
+    return [split(part) for part in output.strip(".").split("...")]
+
+#Drives one browser tab: component props live in values, callbacks are posted the way the Dash renderer does
+class DashSession:
+    def __init__(self, base_url, http, rng, poll_interval):
+        self.base_url = base_url
+        self.http = http
+        self.rng = rng
+        self.poll_interval = poll_interval
+        self.timings = []
+        self.callbacks = {}
+        self.values = {}
+
+    def timed(self, action, fn, *args):
+        started = time.perf_counter()
+        result, error = None, ""
+        try:
+            result = fn(*args)
+        except (requests.RequestException, ValueError, KeyError) as exc:
+            error = repr(exc)
+        self.timings.append(Timing(action, time.perf_counter() - started, error))
+        return result
+
+    def get(self, path):
+        response = self.http.get(self.base_url + path, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response
+
+    def load_page(self):
+        self.get("/")
+        self.get("/_dash-layout")
+        for dep in self.get("/_dash-dependencies").json():
+            #Pattern-matching and clientside callbacks never come from a session replay
+            if dep.get("clientside_function") is None and "{" not in dep["output"]:
+                self.callbacks[dep["output"]] = dep
+
+    #Posts the callback that updates target after changed fired; background callbacks are polled until done,
+    #and another callback for the same target that listens to one of the updated props is fired next, as the renderer chains it
+    def fire(self, target, changed):
+        dep = self.callback_for(target, changed)
+        def props(items):
+            return [dict(id=item["id"], property=item["property"], value=self.values.get(f"{item['id']}.{item['property']}")) for item in items]
+        body = {
+            "output": dep["output"],
+            "outputs": split_outputs(dep["output"]),
+            "inputs": props(dep["inputs"]),
+            "state": props(dep["state"]),
+            "changedPropIds": [changed]
+        }
+        response = self.http.post(self.base_url + "/_dash-update-component", json=body, timeout=REQUEST_TIMEOUT)
+        if dep.get("background"):
+            job = response.json()
+            while True:
+                time.sleep(self.poll_interval)
+                response = self.http.post(
+                    self.base_url + f"/_dash-update-component?cacheKey={job['cacheKey']}&job={job['job']}",
+                    json=body, timeout=REQUEST_TIMEOUT
+                )
+                #204 means the job ended without output for this tab, which the renderer also stops on
+                if response.status_code == 204 or (response.ok and "response" in response.json()):
+                    break
+                response.raise_for_status()
+        if response.status_code == 204:
+            return {}
+        response.raise_for_status()
+
+        updates = response.json().get("response", {})
+        for component, prop_values in updates.items():
+            for prop, value in prop_values.items():
+                self.values[f"{component}.{prop}"] = value
+        for component, prop_values in list(updates.items()):
+            for prop in prop_values:
+                if self.callback_for(target, f"{component}.{prop}") not in (None, dep):
+                    updates.update(self.fire(target, f"{component}.{prop}"))
+        return updates
+
+    def callback_for(self, target, changed):
+        return next((
+            dep for output, dep in self.callbacks.items()
+            if f"{target}." in output and any(f"{item['id']}.{item['property']}" == changed for item in dep["inputs"])
+        ), None)
+
+    def chart_figure(self):
+        def find(node):
+            if isinstance(node, dict):
+                if "figure" in node and isinstance(node["figure"], dict):
+                    return node["figure"]
+                return next((found for found in map(find, node.values()) if found), None)
+            if isinstance(node, list):
+                return next((found for found in map(find, node) if found), None)
+            return None
+        return find(self.values.get("week-chart-container.children")) or {}
+
+    def click(self, want_day):
+        points = [
+            custom[0]
+            for trace in self.chart_figure().get("data", [])
+            for custom in trace.get("customdata") or []
+            if custom and isinstance(custom[0], dict) and (custom[0].get("type") == "day_click") == want_day
+        ]
+        if not points:
+            return
+        self.values["weekly-graph.clickData"] = {"points": [{"customdata": [self.rng.choice(points)]}]}
+        self.timed("day click" if want_day else "event click", self.fire, "event-modal", "weekly-graph.clickData")
+        close = "close-day-modal" if want_day else "close-modal"
+        self.values[f"{close}.n_clicks"] += 1
+        self.timed("close modal", self.fire, "event-modal", f"{close}.n_clicks")
+
+    def navigate(self, button):
+        self.values[f"{button}.n_clicks"] += 1
+        self.timed("navigate", self.fire, "week-offset", f"{button}.n_clicks")
+        self.timed("week label", self.fire, "week-label", "week-offset.data")
+        self.timed("week chart", self.fire, "week-chart-container", "week-offset.data")
+
+    #Landing, then a few prev/next steps, each followed by a look at ongoing events or a click
+    def run(self, steps):
+        self.timed("page load", self.load_page)
+        if not self.callbacks:
+            return self.timings
+        self.values.update({
+            "screen-bucket.data": self.rng.choices(range(len(BUCKET_WEIGHTS)), BUCKET_WEIGHTS)[0],
+            "week-offset.data": 0, "view-mode.data": "week", "casino-filter.data": [], "near-filter.data": None,
+            "prev-button.n_clicks": 0, "next-button.n_clicks": 0, "overflow-toggle.n_clicks": 0,
+            "overflow-prev-page.n_clicks": 0, "overflow-next-page.n_clicks": 0, "overflow-page.data": 0,
+            "close-modal.n_clicks": 0, "close-day-modal.n_clicks": 0, "close-timer.n_intervals": 0
+        })
+        self.timed("sticky header", self.fire, "sticky-header-content", "screen-bucket.data")
+        self.timed("week label", self.fire, "week-label", "screen-bucket.data")
+        self.timed("week chart", self.fire, "week-chart-container", "screen-bucket.data")
+
+        for _ in range(steps):
+            #Disabled at the ends of the navigable window, like the real buttons
+            buttons = [button for button in ("prev-button", "next-button") if not self.values.get(f"{button}.disabled")]
+            self.navigate(self.rng.choice(buttons))
+            action = self.rng.random()
+            if action < 0.3 and self.values.get("overflow-date.data"):
+                self.values["overflow-toggle.n_clicks"] += 1
+                self.timed("overflow toggle", self.fire, "overflow-box", "overflow-toggle.n_clicks")
+            elif action < 0.7:
+                self.click(want_day=False)
+            else:
+                self.click(want_day=True)
+        return self.timings
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def summarize(timings, wall_seconds, sessions):
+    by_action = {}
+    for timing in timings:
+        by_action.setdefault(timing.action, []).append(timing)
+
+    def stats(items):
+        seconds = sorted(item.seconds for item in items if not item.error)
+        errors = [item.error for item in items if item.error]
+        row = {"count": len(items), "errors": len(errors)}
+        row.update({f"p{pct}_ms": round(1000 * percentile(seconds, pct), 1) for pct in PERCENTILES})
+        row["max_ms"] = round(1000 * seconds[-1], 1) if seconds else 0.0
+        if errors:
+            row["first_error"] = errors[0]
+        return row
+
+    return {
+        "sessions": sessions,
+        "wall_seconds": round(wall_seconds, 2),
+        "sessions_per_second": round(sessions / wall_seconds, 2),
+        "actions_per_second": round(len(timings) / wall_seconds, 2),
+        "overall": stats(timings),
+        "actions": {action: stats(items) for action, items in sorted(by_action.items())}
+    }
+
+def run_sessions(base_url, clients, sessions, steps, seed, poll_interval):
+    timings = []
+    lock = threading.Lock()
+
+    def one(index):
+        with requests.Session() as http:
+            result = DashSession(base_url, http, random.Random(seed + index), poll_interval).run(steps)
+        with lock:
+            timings.extend(result)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(one, range(sessions)))
+    return timings, time.perf_counter() - started
+
+def print_report(report):
+    summary = report["summary"]
+    print(f"\n{summary['sessions']} sessions in {summary['wall_seconds']}s: "
+          f"{summary['sessions_per_second']} sessions/s, {summary['actions_per_second']} actions/s")
+    header = f"{'action':<16}{'count':>7}{'errors':>8}" + "".join(f"{'p' + str(pct):>9}" for pct in PERCENTILES) + f"{'max':>9}"
+    print(header + "   (ms)")
+    for action, row in list(summary["actions"].items()) + [("overall", summary["overall"])]:
+        print(f"{action:<16}{row['count']:>7}{row['errors']:>8}" +
+              "".join(f"{row[f'p{pct}_ms']:>9}" for pct in PERCENTILES) + f"{row['max_ms']:>9}")
+    if report.get("workers"):
+        print(f"\n{'worker pid':<12}{'cpu s':>8}{'cpu %':>8}{'rss mean MB':>13}{'rss max MB':>12}")
+        for worker in report["workers"]:
+            print(f"{worker['pid']:<12}{worker['cpu_seconds']:>8}{worker['cpu_percent']:>8}"
+                  f"{worker['rss_mean_mb']:>13}{worker['rss_max_mb']:>12}")
+
+#python -m app_components.loadtest --workers 2 --worker-class gthread --threads 8 --clients 16 --sessions 100
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay Dash sessions against a local gunicorn and report latency and worker load")
+    parser.add_argument("--url", help="Test an already running server instead of booting one (no worker stats)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--worker-class", default="gthread")
+    parser.add_argument("--threads", type=int, default=4, help="Threads per worker (gthread only)")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra server environment, e.g. EVENT_DB=events.db or RENDER_WORKERS=8")
+    parser.add_argument("--keep-cache", action="store_true", help="Use the server's normal render cache and archive instead of fresh ones")
+    parser.add_argument("--server-log", help="Write gunicorn and app output to this file")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent sessions")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=4, help="Prev/next navigations per session")
+    parser.add_argument("--warmup", type=int, default=0, help="Untimed sessions run first")
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="Seconds between background-callback polls")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    if args.worker_class != "gthread":
+        args.threads = 1
+    env_overrides = dict(item.split("=", 1) for item in args.env)
+    server = sampler = None
+    state_dir = None
+    base_url = args.url.rstrip("/") if args.url else f"http://127.0.0.1:{args.port}"
+    log = open(args.server_log or os.devnull, "w")
+    try:
+        if not args.url:
+            state_dir = None if args.keep_cache else tempfile.mkdtemp(prefix="loadtest-")
+            server = boot_server(args.port, args.workers, args.worker_class, args.threads, env_overrides, state_dir, log)
+        if args.warmup:
+            run_sessions(base_url, args.clients, args.warmup, args.steps, args.seed + 10**6, args.poll_interval)
+        if server is not None:
+            sampler = ResourceSampler(server.pid).start()
+        timings, wall_seconds = run_sessions(base_url, args.clients, args.sessions, args.steps, args.seed, args.poll_interval)
+        if sampler is not None:
+            sampler.stop()
+    finally:
+        if server is not None:
+            stop_server(server)
+        if state_dir is not None:
+            shutil.rmtree(state_dir, ignore_errors=True)
+        log.close()
+
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key != "json"},
+        "summary": summarize(timings, wall_seconds, args.sessions),
+        "workers": sampler.summary(wall_seconds) if sampler is not None else []
+    }
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
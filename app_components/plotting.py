@@ -1,10 +1,24 @@
 import plotly.graph_objs as go
+import numpy as np
 import pandas as pd
 from dash import html, dcc
 from datetime import datetime, timedelta
 from math import floor
-from collections import defaultdict
 from .utils import get_dynamic_sizes, get_week_range, PDT
+from .span_index import events_in_range
+from .recurrence import series_keys
+from .text_fit import LABEL_FONT_FAMILY, fit_label, label_font_size
+from .colors import gather_colors, get_color
+
+#Week block geometry shared by the weekly and multi-week figures
+ARROW_OFFSET = 0.1
+PADDING = 0.1
+SLOT_HEIGHT = 0.5
+SLOT_PADDING = 0.075
+ROW_UNIT_HEIGHT = SLOT_HEIGHT + SLOT_PADDING
+
+#Fields carried in click data for the event details modal
+EVENT_DETAIL_COLUMNS = ["EventName", "Casino", "Location", "StartDate", "EndDate", "Offer"]
 
 #Layout config shared across functions
 def get_layout_config(screen_width):
@@ -14,9 +28,10 @@ def get_layout_config(screen_width):
     return font_sizes, padding_sizes, hour_height, label_column_pct
 
 # Function to generate a weekly view given a clicked date
-def generate_weekly_view(clicked_date, df, screen_width=1024):
+def generate_weekly_view(clicked_date, df, screen_width=1024, span_index=None):
     font_sizes, _ = get_dynamic_sizes(screen_width)
     week_start, week_end = get_week_range(clicked_date)
+    df = events_in_range(df, week_start, week_end, span_index)
 
     long_spanning = filter_long_spanning_events(df, week_start, week_end)
     events_filtered = filter_week_events(df, week_start, week_end)
@@ -29,68 +44,48 @@ def generate_weekly_view(clicked_date, df, screen_width=1024):
 
     return fig, long_spanning
 
-#Color map by Casino
-def get_color():
-    color_map = {
-        "ilani": {"bg": "#2c6f7f", "text": "#ffffff"},
-        "Spirit Mountain Casino": {"bg": "#a74321", "text": "#ffffff"},
-        "Lucky Eagle Casino": {"bg": "#862c8e", "text": "#ffffff"},
-        "Muckleshoot Casino": {"bg": "#1e1c29", "text": "#ffffff"},
-        "Little Creek Casino": {"bg": "#3086c3", "text": "#ffffff"},
-        "Red Wind Casino": {"bg": "#e13332", "text": "#ffffff"},
-        "Snoqualmie Casino": {"bg": "#00a9e0", "text": "#ffffff"},
-        "Angel of the Winds Casino": {"bg": "#64c7cc", "text": "#ffffff"},
-        "Lucky Dog Casino": {"bg": "#f07a22", "text": "#000000"},
-        "Legends Casino": {"bg": "#ca9a41", "text": "#000000"},
-        "Chinook Winds Casino": {"bg": "#32373d", "text": "#ffffff"},
-        "Emerald Queen Casino": {"bg": "#d62e52", "text": "#ffffff"},
-        "Rolling Hills Casino": {"bg": "#5b1d1e", "text": "#ffffff"},
-        "Wildhorse Casino": {"bg": "#d21245", "text": "#ffffff"},
-        "Tulalip Casino": {"bg": "#155e6d", "text":"#ffffff"},
-        "Quil Ceda Creek Casino": {"bg": "#9a0709", "text": "#ffffff"},
-        "Seven Feathers Casino": {"bg": "#41c5de", "text": "#000000"}
-    }
-
-    default_colors = {
-        "#ff0000", "#00ff00", "#0000ff", "#ffff00", "#ff00ff",
-        "#00ffff", "#ff8000", "#800000", "#008000", "#000080",
-        "#800080", "#ffa500", "#808080", "#ff6347", "#ff4500",
-        "#ff00ff", "#008080", "#4b0082", "#008b8b", "#000080",
-        "#4682b4"
-    }
-
-    result = {}
-    for casino, colors in color_map.items():
-        result[casino] = colors
-
-    if not result:
-        print(f"No color assigned for casino: {casino}; using default color.")
-        dummy_casinos = [f"Casino {i}" for i in range(len(default_colors))]
-        for casino_name, color in zip(dummy_casinos, default_colors):
-            result[casino_name] = {"bg": color, "text": "#000000"}
-
-    return result
+#Rolling multi-week view: one span query for the whole range, weeks packed and stacked into one figure
+def generate_multiweek_view(clicked_date, df, screen_width=1024, n_weeks=4, span_index=None):
+    font_sizes, _ = get_dynamic_sizes(screen_width)
+    range_start, _ = get_week_range(clicked_date)
+    range_end = range_start + timedelta(weeks=n_weeks)
+    events = events_in_range(df, range_start, range_end, span_index)
+
+    weeks = []
+    for i in range(n_weeks):
+        week_start = range_start + timedelta(weeks=i)
+        week_end = week_start + timedelta(days=7)
+
+        week_events = filter_week_events(events, week_start, week_end)
+        if week_events.empty:
+            weeks.append((week_start, None))
+            continue
+
+        week_events = annotate_events_with_flags(week_events, week_start, week_end)
+        weeks.append((week_start, assign_event_rows(week_events, week_start)))
+
+    long_spanning = get_ongoing_events(range_start, events, n_weeks)
+
+    if all(packed is None for _, packed in weeks):
+        return build_empty_figure("No Events These Weeks"), long_spanning
+
+    return build_multiweek_figure(weeks, font_sizes, screen_width), long_spanning
 
 #Add arrow indicators for events that span outside the week
 def annotate_events_with_flags(events_df: pd.DataFrame, week_start: datetime, week_end: datetime) -> pd.DataFrame:
-    # Add a duration column for sorting, and sort by: both left and right arrows, only left arrow, fully within week, and only right arrow
-    events_df["Duration"] = (events_df["EndDate"] - events_df["StartDate"]).dt.total_seconds()
-    events_df["has_left_arrow"] = events_df["StartDate"] < week_start
-    events_df["has_right_arrow"] = events_df["EndDate"] > week_end
-    
-    def get_overflow_priority(row):
-    #Overflow priority: both arrows -> 0, right only -> 1, none -> 2, left only -> 3
-        if row["has_left_arrow"] and row["has_right_arrow"]:
-            return 0
-        if row["has_right_arrow"]:
-            return 1
-        if not row["has_left_arrow"] and not row["has_right_arrow"]:
-            return 3
-        return 2
-    
-    events_df["overflow_sort"] = events_df.apply(get_overflow_priority, axis=1)
-    
-    return events_df.sort_values(
+    # Add a duration column for sorting, and sort by: both left and right arrows, only right arrow, fully within week, and only left arrow
+    has_left_arrow = events_df["StartDate"] < week_start
+    has_right_arrow = events_df["EndDate"] > week_end
+
+    #Overflow priority: both arrows -> 0, right only -> 1, left only -> 2, none -> 3
+    overflow_sort = np.select([has_left_arrow & has_right_arrow, has_right_arrow, ~has_left_arrow], [0, 1, 3], default=2)
+
+    return events_df.assign(
+        Duration=(events_df["EndDate"] - events_df["StartDate"]).dt.total_seconds(),
+        has_left_arrow=has_left_arrow,
+        has_right_arrow=has_right_arrow,
+        overflow_sort=overflow_sort
+    ).sort_values(
         by=["overflow_sort", "StartDate", "EndDate", "Duration", "Casino"],
         ascending=[True, True, True, False, True]
     ).reset_index(drop=True)
@@ -100,7 +95,27 @@ def filter_long_spanning_events(events_df, week_start, week_end):
     return events_df[
         (events_df["StartDate"] < week_start) &
         (events_df["EndDate"] > week_end)
-    ].copy()
+    ]
+
+#Events covering at least one whole week of the range (the "Ongoing Events" list)
+def get_ongoing_events(clicked_date, df, n_weeks=1, span_index=None):
+    range_start, _ = get_week_range(clicked_date)
+    range_end = range_start + timedelta(weeks=n_weeks)
+    df = events_in_range(df, range_start, range_end, span_index)
+
+    covers_a_week = pd.Series(False, index=df.index)
+    for i in range(n_weeks):
+        week_start = range_start + timedelta(weeks=i)
+        covers_a_week |= (df["StartDate"] < week_start) & (df["EndDate"] > week_start + timedelta(days=7))
+    return df[covers_a_week]
+
+#One display line per ongoing event, formatted column-wise; a missing name or casino is left blank, not "nan"
+def format_ongoing_lines(overflow_df):
+    return (
+        overflow_df["EventName"].fillna("") + " (" + overflow_df["Casino"].fillna("") + ") - " +
+        overflow_df["StartDate"].dt.strftime('%b %d') + " to " +
+        overflow_df["EndDate"].dt.strftime('%b %d')
+    ).tolist()
 
 # Filter events that overlap with the current week, excluding long_spanning events
 def filter_week_events(events_df, week_start, week_end):
@@ -109,227 +124,207 @@ def filter_week_events(events_df, week_start, week_end):
         (events_df["StartDate"] < week_end) &
         ~(events_df["StartDate"] == week_end) &
         ~((events_df["StartDate"] < week_start) & (events_df["EndDate"] > week_end))
-    ].copy()
+    ]
 
+#Row-packing engine: greedy per-day slot assignment that keeps recurring events on the same row.
+#Returns the events in draw order with their visible day range and row_num.
 def assign_event_rows(events_df, week_start):
-    # Layout params
-    row_unit_height = 0.575
     used_rows_by_day = {i: set() for i in range(7)}
-    recurring_rows = defaultdict(int)
-    current_row = 0
+    recurring_rows = {}
     row_nums = []
+    current_row = 0
+    assigned_row = 0
+    packed_groups = []
 
     for priority in sorted(events_df["overflow_sort"].unique()):
-        group_df = events_df[events_df['overflow_sort'] == priority].sort_values(
+        group_df = events_df[events_df["overflow_sort"] == priority].sort_values(
             by=["StartDate", "EndDate", "Duration", "Casino"],
             ascending=[True, True, False, True]
         )
 
-        for idx, row in group_df.iterrows():
-            row = events_df.loc[idx]
-            start_delta = (row["StartDate"] - week_start).total_seconds() / (24 * 3600)
-            end_delta = (row["EndDate"] - week_start).total_seconds() / (24 * 3600)
-
-            # Calculate the visible range of the event within the 7-day week
-            visible_start = max(start_delta, 0)
-            visible_end = min(end_delta, 7)
+        # Calculate the visible range of each event within the 7-day week
+        start_delta = (group_df["StartDate"] - week_start).dt.total_seconds() / (24 * 3600)
+        end_delta = (group_df["EndDate"] - week_start).dt.total_seconds() / (24 * 3600)
+        group_df = group_df.assign(visible_start=start_delta.clip(lower=0), visible_end=end_delta.clip(upper=7))
+        start_days = group_df["visible_start"].apply(floor).clip(lower=0)
+        end_days = (group_df["visible_end"] - 1e-6).apply(floor).clip(upper=6)
 
-            start_day = max(0, floor(visible_start))
-            end_day = min(6, floor(visible_end - 1e-6))
+        #Occurrences of one series keep the same row from week to week
+        series = group_df["SeriesId"] if "SeriesId" in group_df.columns else series_keys(group_df)
 
-            recurring_key = f"{row['EventName']}|{row['Casino']}|{row['StartDate'].time()}|{row['EndDate'].time()}"
+        group_rows = []
+        for recurring_key, start_day, end_day in zip(series, start_days, end_days):
+            days = range(start_day, end_day + 1)
             preferred_row = recurring_rows.get(recurring_key)
             row_assigned = False
 
             #First try preferred row
-            if preferred_row is not None and all(preferred_row not in used_rows_by_day[d] for d in range(start_day, end_day + 1)):
+            if preferred_row is not None and all(preferred_row not in used_rows_by_day[d] for d in days):
                 assigned_row = preferred_row
                 row_assigned = True
             else:
+                #If not usable, find a new row
                 for r in range(current_row, 100):
-                    if all(r not in used_rows_by_day[d] for d in range(start_day, end_day + 1)):
+                    if all(r not in used_rows_by_day[d] for d in days):
                         assigned_row = r
                         recurring_rows[recurring_key] = r
                         row_assigned = True
                         break
 
-            #If not usable, find a new row
             if row_assigned:
-                for d in range(start_day, end_day + 1):
+                for d in days:
                     used_rows_by_day[d].add(assigned_row)
-                events_df.at[idx, "row_num"] = assigned_row
                 row_nums.append(assigned_row)
-            
-            current_row = max(row_nums, default=current_row) + 1
-    
-    return events_df
+            group_rows.append(assigned_row)
+
+        packed_groups.append(group_df.assign(row_num=group_rows))
+        current_row = max(row_nums, default=current_row) + 1
 
-def build_empty_figure():
+    return pd.concat(packed_groups)
+
+def build_empty_figure(title="No Events This Week"):
     return go.Figure(
         layout=go.Layout(
-            title="No Events This Week",
+            title=title,
             xaxis=dict(visible=False),
             yaxis=dict(visible=False)
         )
     )
 
-def build_weekly_figure(events_df, font_sizes, screen_width, week_start):
+#Horizontal extent of each packed block in day units; arrows take the place of the clipped edge
+def block_extents(packed_df):
+    starts = packed_df["visible_start"].where(~packed_df["has_left_arrow"], PADDING)
+    ends = packed_df["visible_end"].where(~packed_df["has_right_arrow"], 7 - PADDING)
+    return starts.tolist(), ends.tolist()
+
+#Week events packed into rows: filtered to the week, flagged for arrows and given row_num.
+#Annotating renumbers the rows, so the original labels are kept in EventId.
+def pack_week_events(events_df, week_start, week_end):
+    events_filtered = filter_week_events(events_df, week_start, week_end)
+    events_filtered = events_filtered.assign(EventId=events_filtered.index)
+    if events_filtered.empty:
+        return events_filtered
+    return assign_event_rows(annotate_events_with_flags(events_filtered, week_start, week_end), week_start)
+
+#Blocks, arrows, labels and click points for one packed week, drawn from y_offset upward
+def build_week_elements(packed_df, font_sizes, screen_width, y_offset=0):
     shapes = []
     annotations = []
-    hover_markers = []
+    click_points = {"x": [], "y": [], "text": [], "customdata": []}
 
-    ARROW_OFFSET = 0.1
-    PADDING = 0.1
-    slot_height = 0.5
-    slot_padding = 0.075
-    row_unit_height = slot_height + slot_padding
-    MIN_ROWS = 5
+    font_size = label_font_size(screen_width)
 
-    used_rows_by_day = {i: set() for i in range(7)}
-    recurring_rows = {}
-    row_nums = []
-    current_row = 0
+    block_starts, block_ends = block_extents(packed_df)
+    block_colors, text_colors = gather_colors(packed_df["Casino"])
+    for row, adjusted_start, adjusted_end, color, text_color in zip(
+        packed_df.itertuples(index=False), block_starts, block_ends, block_colors, text_colors
+    ):
+        y_center = y_offset + (row.row_num + 0.5) * ROW_UNIT_HEIGHT
 
-    tick_labels = [
-        (week_start + timedelta(days=i)).strftime('%a') + '<br>' +
-        (week_start + timedelta(days=i)).strftime('%b %d') for i in range(7)
-    ]
+        label = row.EventName
+        trimmed_label = fit_label(label, adjusted_end - adjusted_start, screen_width)
 
-    for i in range(1, 7):
         shapes.append(dict(
-            type="line",
-            x0=i, x1=i,
-            y0=-0.5,
-            y1=100,  # placeholder; replaced later
+            type="rect",
+            x0=adjusted_start,
+            x1=adjusted_end,
+            y0=y_center - SLOT_HEIGHT / 2,
+            y1=y_center + SLOT_HEIGHT / 2,
+            fillcolor=color,
             line=dict(color="black", width=1),
-            layer="below"
+            layer="above"
         ))
 
-    grouped = events_df.copy()
-
-    casino_colors = get_color()
-
-    for priority in sorted(grouped["overflow_sort"].unique()):
-        group_df = grouped[grouped["overflow_sort"] == priority]
-        group_df = group_df.sort_values(by=["StartDate", "EndDate", "Duration", "Casino"], ascending=[True, True, False, True])
-
-        for idx, row in group_df.iterrows():
-            start_delta = (row["StartDate"] - week_start).total_seconds() / (24 * 3600)
-            end_delta = (row["EndDate"] - week_start).total_seconds() / (24 * 3600)
-
-            visible_start = max(start_delta, 0)
-            visible_end = min(end_delta, 7)
-            start_day = max(0, floor(visible_start))
-            end_day = min(6, floor(visible_end - 1e-6))
-
-            recurring_key = f"{row['EventName']}|{row['Casino']}|{row['StartDate'].time()}|{row['EndDate'].time()}"
-            preferred_row = recurring_rows.get(recurring_key)
-            row_assigned = False
-
-            if preferred_row is not None and all(preferred_row not in used_rows_by_day[d] for d in range(start_day, end_day + 1)):
-                assigned_row = preferred_row
-                row_assigned = True
-            else:
-                for r in range(current_row, 100):
-                    if all(r not in used_rows_by_day[d] for d in range(start_day, end_day + 1)):
-                        assigned_row = r
-                        recurring_rows[recurring_key] = r
-                        row_assigned = True
-                        break
-
-            if row_assigned:
-                for d in range(start_day, end_day + 1):
-                    used_rows_by_day[d].add(assigned_row)
-                row_nums.append(assigned_row)
-
-            row_num = assigned_row
-            y_center = (row_num + 0.5) * row_unit_height
-
-            adjusted_start = 0 + PADDING if row["has_left_arrow"] else visible_start
-            adjusted_end = 7 - PADDING if row["has_right_arrow"] else visible_end
-            block_width = adjusted_end - adjusted_start
-
-            # Font and trimming
-            CHARS_PER_UNIT = 10 if screen_width < 480 else 20 if screen_width < 768 else 30 if screen_width < 1024 else 40
-            max_chars = max(int(block_width * CHARS_PER_UNIT), 0)
-
-            label = row["EventName"]
-            trimmed_label = (
-                label if len(label) <= max_chars else
-                (label[:max_chars - 2] + "...") if max_chars >= 3 else
-                "" if max_chars < 3 else "..."
-            )
-
-            color = casino_colors[row["Casino"]]["bg"]
-            text_color = casino_colors[row["Casino"]]["text"]
+        if row.has_left_arrow:
+            shapes.append(dict(
+                type="path",
+                path=f"M 0,{y_center} L{ARROW_OFFSET},{y_center + 0.2} L{ARROW_OFFSET},{y_center - 0.2} Z",
+                fillcolor="black",
+                line=dict(color="black", width=1),
+                layer="above"
+            ))
 
+        if row.has_right_arrow:
             shapes.append(dict(
-                type="rect",
-                x0=adjusted_start,
-                x1=adjusted_end,
-                y0=y_center - slot_height / 2,
-                y1=y_center + slot_height / 2,
-                fillcolor=color,
+                type="path",
+                path=f"M 7,{y_center} L{7 - ARROW_OFFSET},{y_center + 0.2} L{7 - ARROW_OFFSET},{y_center - 0.2} Z",
+                fillcolor="black",
                 line=dict(color="black", width=1),
                 layer="above"
             ))
 
-            if row["has_left_arrow"]:
-                shapes.append(dict(
-                    type="path",
-                    path=f"M 0,{y_center} L{ARROW_OFFSET},{y_center + 0.2} L{ARROW_OFFSET},{y_center - 0.2} Z",
-                    fillcolor="black",
-                    line=dict(color="black", width=1),
-                    layer="above"
-                ))
-
-            if row["has_right_arrow"]:
-                shapes.append(dict(
-                    type="path",
-                    path=f"M 7,{y_center} L{7 - ARROW_OFFSET},{y_center + 0.2} L{7 - ARROW_OFFSET},{y_center - 0.2} Z",
-                    fillcolor="black",
-                    line=dict(color="black", width=1),
-                    layer="above"
-                ))
-
-            try:
-                font_size = float(font_sizes["event_block"].replace("rem", "")) * 12
-            except:
-                font_size = 12
+        annotations.append(dict(
+            x=(adjusted_start + adjusted_end) / 2,
+            y=y_center,
+            text=trimmed_label,
+            showarrow=False,
+            font=dict(family=LABEL_FONT_FAMILY, size=font_size, color=text_color),
+            xanchor="center",
+            yanchor="middle"
+        ))
 
-            annotations.append(dict(
-                x=(adjusted_start + adjusted_end) / 2,
-                y=y_center,
-                text=trimmed_label,
-                showarrow=False,
-                font=dict(size=font_size, color=text_color),
-                xanchor="center",
-                yanchor="middle"
-            ))
+        click_points["x"].append((adjusted_start + adjusted_end) / 2)
+        click_points["y"].append(y_center)
+        click_points["text"].append(label)
+        click_points["customdata"].append([{col: getattr(row, col) for col in EVENT_DETAIL_COLUMNS}])
+
+    return shapes, annotations, click_points
+
+#All event click points of a figure batched into a single trace
+def build_event_click_trace(click_points):
+    return go.Scatter(
+        x=click_points["x"],
+        y=click_points["y"],
+        text=click_points["text"],
+        mode="markers",
+        marker=dict(size=30, opacity=0.2, color="orange"),
+        hoverinfo="text",
+        showlegend=False,
+        customdata=click_points["customdata"],
+        name=""
+    )
 
-            hover_markers.append(go.Scatter(
-                x=[(adjusted_start + adjusted_end) / 2],
-                y=[y_center],
-                text=[label],
-                mode="markers",
-                marker=dict(size=30, opacity=0.2, color="orange"),
-                hoverinfo="text",
-                showlegend=False,
-                customdata=[[row.to_dict()]]
-            ))
+def build_day_lines(y_top):
+    return [dict(
+        type="line",
+        x0=i, x1=i,
+        y0=-0.5,
+        y1=y_top,
+        line=dict(color="black", width=1),
+        layer="below"
+    ) for i in range(1, 7)]
+
+def build_weekday_axis(font_sizes, tick_labels):
+    return dict(
+        type="linear",
+        tickmode="array",
+        tickvals=[i + 0.5 for i in range(7)],
+        ticktext=[f"<b style='color:#00008B;font-size:{font_sizes['event_block']};'>{label}</b>" for label in tick_labels],
+        side="top",
+        showgrid=True,
+        gridcolor="lightgray",
+        zeroline=False,
+        range=[0, 7],
+        fixedrange=True
+    )
 
-        current_row = max(row_nums, default=current_row) + 1
+def build_weekly_figure(events_df, font_sizes, screen_width, week_start):
+    MIN_ROWS = 5
 
-    total_rows = max(row_nums, default=0)
+    tick_labels = [
+        (week_start + timedelta(days=i)).strftime('%a') + '<br>' +
+        (week_start + timedelta(days=i)).strftime('%b %d') for i in range(7)
+    ]
+
+    packed = assign_event_rows(events_df, week_start)
+    event_shapes, annotations, click_points = build_week_elements(packed, font_sizes, screen_width)
+
+    total_rows = max(packed["row_num"].max(), 0)
     adjusted_rows = max(MIN_ROWS, total_rows)
-    base_y_top = adjusted_rows * row_unit_height + 0.5
+    base_y_top = adjusted_rows * ROW_UNIT_HEIGHT + 0.5
     chart_height = int(base_y_top * 40)
 
-    # Update lines to correct Y range
-    for shape in shapes:
-        if shape["type"] == "line":
-            shape["y1"] = base_y_top
-            
+    hover_markers = [build_event_click_trace(click_points)]
     for day_index in range(7):
         hover_markers.append(go.Scatter(
             x=[day_index + 0.5],
@@ -351,20 +346,9 @@ def build_weekly_figure(events_df, font_sizes, screen_width, week_start):
         data=hover_markers,
         layout=go.Layout(
             clickmode='event+select',
-            shapes=shapes,
+            shapes=build_day_lines(base_y_top) + event_shapes,
             annotations=annotations,
-            xaxis=dict(
-                type="linear",
-                tickmode="array",
-                tickvals=[i + 0.5 for i in range(7)],
-                ticktext=[f"<b style='color:#00008B;font-size:{font_sizes['event_block']};'>{label}</b>" for label in tick_labels],
-                side="top",
-                showgrid=True,
-                gridcolor="lightgray",
-                zeroline=False,
-                range=[0, 7],
-                fixedrange=True
-            ),
+            xaxis=build_weekday_axis(font_sizes, tick_labels),
             yaxis=dict(
                 range=[-0.5, base_y_top + 0.5],
                 showgrid=False,
@@ -376,169 +360,138 @@ def build_weekly_figure(events_df, font_sizes, screen_width, week_start):
         )
     )
 
-#Generate a responsive 24-hour vertical day view with absolutely positioned event blocks.
-def generate_day_view_html(events_df, clicked_date, get_color_fn, screen_width=1024):
-    font_sizes, padding_sizes, hour_height, label_column_pct = get_layout_config(screen_width)
+#Weeks stacked top to bottom in one figure; each band is sized to its own packed rows
+def build_multiweek_figure(weeks, font_sizes, screen_width):
+    MIN_BAND_ROWS = 2
+    BAND_HEADER = 0.6
 
-    #Normalize clicked_date
-    day_start = clicked_date.astimezone(PDT).replace(hour=0, minute=0, second=0, microsecond=0)
-    day_end = day_start + timedelta(days=1)
-    
-    #Filter events strictly within the day
-    events = events_df.copy()
-    events["StartDate"] = pd.to_datetime(events["StartDate"]).dt.tz_convert(PDT)
-    events["EndDate"] = pd.to_datetime(events["EndDate"]).dt.tz_convert(PDT)
+    shapes = []
+    annotations = []
+    click_points = {"x": [], "y": [], "text": [], "customdata": []}
+    day_points = {"x": [], "y": [], "customdata": []}
+
+    #Lay bands out from the bottom so the first week ends up on top
+    y_offset = 0
+    for week_start, packed in reversed(weeks):
+        rows = MIN_BAND_ROWS if packed is None else max(MIN_BAND_ROWS, packed["row_num"].max() + 1)
+        band_top = y_offset + rows * ROW_UNIT_HEIGHT + BAND_HEADER
+
+        if packed is not None:
+            week_shapes, week_annotations, week_points = build_week_elements(packed, font_sizes, screen_width, y_offset)
+            shapes += week_shapes
+            annotations += week_annotations
+            for key in click_points:
+                click_points[key] += week_points[key]
+
+        for day_index in range(7):
+            day = week_start + timedelta(days=day_index)
+            annotations.append(dict(
+                x=day_index + 0.05,
+                y=band_top - BAND_HEADER / 2,
+                text=f"<b>{day.strftime('%b %d')}</b>",
+                showarrow=False,
+                font=dict(size=10, color="#00008B"),
+                xanchor="left",
+                yanchor="middle"
+            ))
+            day_points["x"].append(day_index + 0.5)
+            day_points["y"].append(band_top - BAND_HEADER / 2)
+            day_points["customdata"].append([{
+                "type": "day_click",
+                "day_index": day_index,
+                "date": day.strftime('%Y-%m-%d')
+            }])
+
+        #Separator between this week and the one above it
+        shapes.append(dict(
+            type="line",
+            x0=0, x1=7,
+            y0=band_top, y1=band_top,
+            line=dict(color="gray", width=2),
+            layer="below"
+        ))
+        y_offset = band_top
+
+    base_y_top = y_offset
+
+    return go.Figure(
+        data=[
+            build_event_click_trace(click_points),
+            go.Scatter(
+                x=day_points["x"],
+                y=day_points["y"],
+                mode="markers",
+                marker=dict(size=16, opacity=0.1, color='red'),
+                hoverinfo="text",
+                hovertext=["View Day's Events"] * len(day_points["x"]),
+                customdata=day_points["customdata"],
+                showlegend=False,
+                name=""
+            )
+        ],
+        layout=go.Layout(
+            clickmode='event+select',
+            shapes=build_day_lines(base_y_top) + shapes,
+            annotations=annotations,
+            xaxis=build_weekday_axis(font_sizes, [(weeks[0][0] + timedelta(days=i)).strftime('%a') for i in range(7)]),
+            yaxis=dict(
+                range=[-0.5, base_y_top + 0.5],
+                showgrid=False,
+                visible=False,
+                fixedrange=True
+            ),
+            height=int(base_y_top * 40),
+            margin=dict(t=40, b=20, l=20, r=20)
+        )
+    )
+
+#Events that start and end within the day, stacked into side-by-side tracks where they overlap
+def assign_day_tracks(events_df, day_start):
+    events = events_df.assign(
+        StartDate=pd.to_datetime(events_df["StartDate"]).dt.tz_convert(PDT),
+        EndDate=pd.to_datetime(events_df["EndDate"]).dt.tz_convert(PDT)
+    )
     events = events[
-        (events["StartDate"] >= day_start) & 
-        (events["EndDate"] <= day_end)
+        (events["StartDate"] >= day_start) &
+        (events["EndDate"] <= day_start + timedelta(days=1))
     ]
-    
-    day_label = clicked_date.strftime("%A, %B %d")
-    
-    if events.empty:
-        return [html.Div(f"No events scheduled for {day_label}.", style={
-            "textAlign": "center",
-            "padding": padding_sizes.get("base", "1rem"),
-            "fontSize": font_sizes.get("legend_title", "1.1rem")
-        })]
 
-    #Time math
-    events["start_offset_min"] = (events["StartDate"] - day_start).dt.total_seconds() / 60
-    events["end_offset_min"] = (events["EndDate"] - day_start).dt.total_seconds() / 60
-    events["duration_min"] = events["end_offset_min"] - events["start_offset_min"]
-    events = events.sort_values(by=["start_offset_min", "duration_min"])
+    start_offset_min = (events["StartDate"] - day_start).dt.total_seconds() / 60
+    end_offset_min = (events["EndDate"] - day_start).dt.total_seconds() / 60
+    events = events.assign(
+        start_offset_min=start_offset_min,
+        end_offset_min=end_offset_min,
+        duration_min=end_offset_min - start_offset_min
+    ).sort_values(by=["start_offset_min", "duration_min"])
 
     #Assign tracks dynamically to avoid overlap
     tracks = []
     track_assignments = []
-
-    for _, event in events.iterrows():
-        placed = False
+    for start, end in zip(events["start_offset_min"], events["end_offset_min"]):
         for i, track in enumerate(tracks):
-            if all(event["start_offset_min"] >= t[1] or event["end_offset_min"] <= t[0] for t in track):
-                track.append((event["start_offset_min"], event["end_offset_min"]))
+            if all(start >= t[1] or end <= t[0] for t in track):
+                track.append((start, end))
                 track_assignments.append(i)
-                placed = True
                 break
-        if not placed:
-            tracks.append([(event["start_offset_min"], event["end_offset_min"])])
+        else:
+            tracks.append([(start, end)])
             track_assignments.append(len(tracks) - 1)
-        
-    events["overlap_index"] = track_assignments
-    n_tracks = len(tracks)
-    width_pct = (100 - label_column_pct) / n_tracks
-    
-    color_map = get_color_fn()
-    hour_blocks = []
-    event_blocks = []
-    click_markers = []
-
-    for hour in range(24):
-        top_px = hour * hour_height
-        label = f"{hour:02d}:00" if hour % 3 == 0 else ""
-        
-        #Label on left
-        hour_blocks.append(html.Div(
-            label, 
-            style={
-                "position": "absolute",
-                "top": f"{top_px}px",
-                "left": "0",
-                "width": f"{label_column_pct}%",
-                "height": f"{hour_height}px",
-                "fontSize": font_sizes.get('overflow', '0.75rem'),
-                "color": "#6A5ACD",
-                "paddingLeft": padding_sizes.get("small", "6px"),
-                "boxSizing": "border-box",
-                "zIndex": 5,
-                "backgroundColor": "#f5f3fa"
-            }
-        ))
-        
-    # #Full-width grid line
-    # hour_blocks.append(html.Div(
-    #     "",
-    #     style={
-    #         "position": "absolute",
-    #         "top": f"{top_px}px",
-    #         "left": "0",
-    #         "width": "100%",
-    #         "height": "1px",
-    #         "backgroundColor": "#aaa",
-    #         "opacity": 0.7,
-    #         "zIndex": 1,
-    #     }
-    # ))  
-    
-    #Event blocks + invisible click markers
-    for _, row in events.iterrows():
-        top_px = row["start_offset_min"] / 60 * hour_height 
-        height_px = max(20, row["duration_min"] / 60 * hour_height)
-        left_pct = label_column_pct + row["overlap_index"] * width_pct
-
-        color = color_map.get(row["Casino"], {"bg": "#aaa"})["bg"]
-
-        #Visible block
-        event_blocks.append(html.Div(
-            title=row["EventName"],
-            style={
-                "position": "absolute",
-                "top": f"{top_px}px",
-                "left": f"{left_pct}%",
-                "width": f"{width_pct}%",
-                "height": f"{height_px}px",
-                "backgroundColor": color,
-                "border": "2px solid #444",
-                "borderRadius": padding_sizes.get("xxs", "4px"),
-                "boxSizing": "border-box",
-                "zIndex": 10,
-                "cursor": "pointer"
-            }
-        ))
-        
-        #Invisible click marker for modal
-        center_y = top_px + height_px / 2
-        event_data = row[["EventName", "Casino", "Location", "StartDate", "EndDate", "Offer"]].to_dict()
-        
-        click_markers.append(go.Scatter(
-            x=[0.5],
-            y=[center_y],
-            mode="markers",
-            marker=dict(size=40, opacity=0.3, color="orange"),
-            customdata=[[event_data]],
-            hoverinfo="skip",
-            showlegend=False
-        ))
-    
-    #Clickable overlay graph
-    click_graph = dcc.Graph(
-        id="day-event-catcher",
-        figure=go.Figure(
-            data=click_markers,
-            layout=go.Layout(
-                clickmode='event+select',
-                xaxis=dict(visible=False, range=[0,1], fixedrange=True),
-                yaxis=dict(visible=False, range=[0, 24 * hour_height], fixedrange=True),
-                margin=dict(l=0, r=0, t=0, b=0),
-                height=24 * hour_height,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-        ),
-        config={'displayModeBar': False},
-        style={
-            "position": "absolute",
-            "top": "0",
-            "left": "0",
-            "width": "100%",
-            "height": f"{24 * hour_height}px",
-            "zIndex": 1000,
-            "pointerEvents": "auto"
-        }
-    )
 
-    #Sticky Add day label + scrollable grid container
-    header = html.Div(
+    return events.assign(overlap_index=track_assignments), len(tracks)
+
+#Day label on top of the scrolling day grid
+def build_day_header(clicked_date, screen_width=1024, has_events=True):
+    font_sizes, padding_sizes = get_dynamic_sizes(screen_width)
+    day_label = clicked_date.strftime("%A, %B %d")
+
+    if not has_events:
+        return html.Div(f"No events scheduled for {day_label}.", style={
+            "textAlign": "center",
+            "padding": padding_sizes.get("base", "1rem"),
+            "fontSize": font_sizes.get("legend_title", "1.1rem")
+        })
+
+    return html.Div(
         day_label,
         style={
             "fontWeight": "bold",
@@ -553,16 +506,90 @@ def generate_day_view_html(events_df, clicked_date, get_color_fn, screen_width=1
             "padding": padding_sizes.get("xxs", "6px")
         }
     )
-    
+
+#24-hour day grid as one figure: hour bands and event blocks are shapes, all click points one trace.
+#y runs in minutes from midnight (top) and x in percent of the width, label column first.
+def build_day_figure(events_df, clicked_date, screen_width=1024):
+    font_sizes, _, hour_height, label_column_pct = get_layout_config(screen_width)
+    day_start = clicked_date.astimezone(PDT).replace(hour=0, minute=0, second=0, microsecond=0)
+    events, n_tracks = assign_day_tracks(events_df, day_start)
+    if events.empty:
+        return None
+
+    width_pct = (100 - label_column_pct) / n_tracks
+    min_block_min = 20 / hour_height * 60
+    label_font = float(font_sizes.get("overflow", "0.75rem").replace("rem", "")) * 12
+
+    shapes = [dict(
+        type="rect",
+        x0=0, x1=label_column_pct,
+        y0=hour * 60, y1=(hour + 1) * 60,
+        fillcolor="#f5f3fa",
+        line=dict(width=0),
+        layer="below"
+    ) for hour in range(24)]
+    annotations = [dict(
+        x=1, y=hour * 60,
+        text=f"{hour:02d}:00",
+        showarrow=False,
+        xanchor="left",
+        yanchor="top",
+        font=dict(size=label_font, color="#6A5ACD")
+    ) for hour in range(0, 24, 3)]
+
+    click_points = {"x": [], "y": [], "text": [], "customdata": []}
+    for row, color in zip(events.itertuples(index=False), gather_colors(events["Casino"])[0]):
+        x0 = label_column_pct + row.overlap_index * width_pct
+        y1 = row.start_offset_min + max(min_block_min, row.duration_min)
+
+        shapes.append(dict(
+            type="rect",
+            x0=x0, x1=x0 + width_pct,
+            y0=row.start_offset_min, y1=y1,
+            fillcolor=color,
+            line=dict(color="#444", width=2),
+            layer="above"
+        ))
+        click_points["x"].append(x0 + width_pct / 2)
+        click_points["y"].append((row.start_offset_min + y1) / 2)
+        click_points["text"].append(row.EventName)
+        click_points["customdata"].append([{col: getattr(row, col) for col in EVENT_DETAIL_COLUMNS}])
+
+    return go.Figure(
+        data=[build_event_click_trace(click_points)],
+        layout=go.Layout(
+            clickmode='event+select',
+            dragmode=False,
+            shapes=shapes,
+            annotations=annotations,
+            xaxis=dict(visible=False, range=[0, 100], fixedrange=True),
+            yaxis=dict(visible=False, range=[24 * 60, 0], fixedrange=True),
+            margin=dict(l=0, r=0, t=0, b=0),
+            height=24 * hour_height,
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+    )
+
+def day_graph_style(screen_width=1024, visible=True):
+    _, _, hour_height, _ = get_layout_config(screen_width)
+    if not visible:
+        return {"display": "none"}
+    return {"height": f"{24 * hour_height}px", "width": "100%"}
+
+#Responsive 24-hour day view: the day label plus a single-figure day grid
+def generate_day_view_html(events_df, clicked_date, screen_width=1024):
+    fig = build_day_figure(events_df, clicked_date, screen_width)
+    header = build_day_header(clicked_date, screen_width, has_events=fig is not None)
+    if fig is None:
+        return [header]
+
     return [
         header,
-        html.Div(
-            children=hour_blocks + event_blocks + [click_graph],
-            style={
-                "position": "relative",
-                "height": f"{24 * hour_height}px",
-                "width": "100%",
-                "boxSizing": "border-box"
-            }
+        dcc.Graph(
+            id="day-event-catcher",
+            figure=fig,
+            config={'displayModeBar': False},
+            style=day_graph_style(screen_width)
         )
-    ]
\ No newline at end of file
+    ]
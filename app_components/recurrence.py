@@ -0,0 +1,224 @@
+import argparse
+import threading
+from datetime import datetime, time, timedelta
+from typing import NamedTuple, Optional, FrozenSet
+import pandas as pd
+from .utils import PDT
+
+#RRULE subset: FREQ=DAILY|WEEKLY;INTERVAL=n;BYDAY=SU,MO,...;UNTIL=YYYYMMDD[THHMMSS]
+RRULE_WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+OCCURRENCE_ID_BASE = 10 ** 9
+OCCURRENCE_CACHE_SIZE = 256
+MIN_SERIES_LENGTH = 3
+
+class Recurrence(NamedTuple):
+    freq: str
+    interval: int
+    weekdays: Optional[FrozenSet[int]]
+    until: Optional[datetime]
+
+def parse_rrule(rule):
+    parts = dict(part.split("=", 1) for part in rule.upper().replace("RRULE:", "").split(";") if part)
+    unsupported = set(parts) - {"FREQ", "INTERVAL", "BYDAY", "UNTIL"}
+    if unsupported or parts.get("FREQ") not in ("DAILY", "WEEKLY"):
+        raise ValueError(f"Unsupported RRule: {rule}")
+
+    weekdays = frozenset(RRULE_WEEKDAYS.index(day) for day in parts["BYDAY"].split(",")) if "BYDAY" in parts else None
+    until = None
+    if "UNTIL" in parts:
+        value = parts["UNTIL"].rstrip("Z")
+        #A bare date means the whole day is included
+        until = datetime.strptime(value, "%Y%m%dT%H%M%S") if "T" in value else datetime.combine(datetime.strptime(value, "%Y%m%d"), time.max)
+        until = PDT.localize(until)
+
+    return Recurrence(parts["FREQ"], int(parts.get("INTERVAL", 1)), weekdays, until)
+
+def format_rrule(recurrence):
+    parts = [f"FREQ={recurrence.freq}"]
+    if recurrence.interval != 1:
+        parts.append(f"INTERVAL={recurrence.interval}")
+    if recurrence.weekdays:
+        #Calendar order, Sunday first
+        parts.append("BYDAY=" + ",".join(RRULE_WEEKDAYS[d] for d in sorted(recurrence.weekdays, key=lambda d: (d + 1) % 7)))
+    if recurrence.until is not None:
+        parts.append(f"UNTIL={recurrence.until.strftime('%Y%m%dT%H%M%S')}")
+    return ";".join(parts)
+
+def _week_sunday(day):
+    return day - timedelta(days=(day.weekday() + 1) % 7)
+
+def _matches(recurrence, first_day, day):
+    if recurrence.freq == "DAILY":
+        return (day - first_day).days % recurrence.interval == 0 and (
+            recurrence.weekdays is None or day.weekday() in recurrence.weekdays)
+
+    weekdays = recurrence.weekdays or {first_day.weekday()}
+    weeks = (_week_sunday(day) - _week_sunday(first_day)).days // 7
+    return day.weekday() in weekdays and weeks % recurrence.interval == 0
+
+#(day offset from the first occurrence, start) for occurrences overlapping [window_start, window_end)
+def occurrence_starts(template_start, duration, recurrence, window_start, window_end):
+    first_day = template_start.date()
+    day = max(first_day, (window_start - duration).astimezone(PDT).date())
+    last_day = window_end.astimezone(PDT).date()
+    if recurrence.until is not None:
+        last_day = min(last_day, recurrence.until.date())
+
+    start_time = template_start.time()
+    while day <= last_day:
+        if _matches(recurrence, first_day, day):
+            start = PDT.localize(datetime.combine(day, start_time))
+            in_series = recurrence.until is None or start <= recurrence.until
+            if in_series and start < window_end and start + duration > window_start:
+                yield (day - first_day).days, start
+        day += timedelta(days=1)
+
+#Occurrence ids sit above every real row id and encode (template label, days after its first occurrence)
+def occurrence_label(label, day_offset):
+    return OCCURRENCE_ID_BASE + label * 100000 + day_offset
+
+def parse_occurrence_label(value):
+    if value < OCCURRENCE_ID_BASE:
+        return None
+    return divmod(value - OCCURRENCE_ID_BASE, 100000)
+
+#The template's occurrence day_offset days after its first one, or None if the rule skips that day
+def occurrence_at(template, day_offset):
+    duration = template["EndDate"] - template["StartDate"]
+    day = template["StartDate"].date() + timedelta(days=day_offset)
+    start = PDT.localize(datetime.combine(day, template["StartDate"].time()))
+    found = occurrence_starts(template["StartDate"], duration, parse_rrule(template["RRule"]), start, start + duration)
+    if day_offset not in (offset for offset, _ in found):
+        return None
+    occurrence = template.drop("RRule")
+    occurrence["StartDate"] = start
+    occurrence["EndDate"] = start + duration
+    return occurrence
+
+def split_templates(df):
+    if "RRule" not in df.columns:
+        return df, df.iloc[0:0]
+    is_template = df["RRule"].notna()
+    return df[~is_template], df[is_template]
+
+#Concrete rows for every template occurrence in the window, labelled stably per (template, day)
+def expand_occurrences(templates, window_start, window_end):
+    rows = []
+    labels = []
+    for label, template in templates.iterrows():
+        recurrence = parse_rrule(template["RRule"])
+        duration = template["EndDate"] - template["StartDate"]
+        for day_offset, start in occurrence_starts(template["StartDate"], duration, recurrence, window_start, window_end):
+            row = template.to_dict()
+            row["StartDate"] = start
+            row["EndDate"] = start + duration
+            rows.append(row)
+            labels.append(occurrence_label(label, day_offset))
+
+    occurrences = pd.DataFrame(rows, index=labels, columns=templates.columns)
+    for col in ["StartDate", "EndDate"]:
+        occurrences[col] = pd.to_datetime(occurrences[col], utc=True).dt.tz_convert(PDT)
+    return occurrences.drop(columns=["RRule"])
+
+_occurrences = {}
+_occurrence_lock = threading.Lock()
+
+#Expanded once per (data version, window) and reused by every render of that window
+def get_occurrences(version, templates, window_start, window_end):
+    key = (version, pd.Timestamp(window_start).value, pd.Timestamp(window_end).value)
+    occurrences = _occurrences.get(key)
+    if occurrences is None:
+        occurrences = expand_occurrences(templates, window_start, window_end)
+        with _occurrence_lock:
+            if len(_occurrences) >= OCCURRENCE_CACHE_SIZE:
+                _occurrences.clear()
+            _occurrences[key] = occurrences
+    return occurrences
+
+#Last instant a template can cover: its UNTIL plus one duration, or open-ended
+def series_ends(templates):
+    ends = []
+    for _, template in templates.iterrows():
+        until = parse_rrule(template["RRule"]).until
+        ends.append(pd.Timestamp.max.tz_localize("UTC") if until is None else pd.Timestamp(until) + (template["EndDate"] - template["StartDate"]))
+    return pd.Series(ends, index=templates.index)
+
+#Rows repeating the same event at the same times share a series; each template is its own series
+def series_keys(df):
+    keys = (
+        df["EventName"].fillna("") + "|" + df["Casino"].fillna("") + "|" +
+        df["StartDate"].dt.strftime("%H:%M:%S").fillna("") + "|" +
+        df["EndDate"].dt.strftime("%H:%M:%S").fillna("")
+    )
+    if "RRule" in df.columns:
+        keys = keys.where(df["RRule"].isna(), "rrule|" + df.index.astype(str))
+    return keys
+
+#Fills known (series key -> id) as it goes, so rows appended later join their existing series
+def assign_series_ids(df, known=None):
+    keys = series_keys(df)
+    if not known:
+        codes, uniques = pd.factorize(keys)
+        if known is not None:
+            known.update(zip(uniques, range(len(uniques))))
+        return df.assign(SeriesId=codes)
+    return df.assign(SeriesId=[known.setdefault(key, len(known)) for key in keys])
+
+#Collapse runs of repeated rows into weekly templates, keeping only runs the rule reproduces exactly
+def compact_events(df):
+    df = df.copy()
+    if "RRule" not in df.columns:
+        df["RRule"] = None
+    plain, templates = split_templates(df)
+
+    group_cols = ["EventName", "Casino", "Location", "Offer"]
+    keyed = plain.assign(
+        _start_time=plain["StartDate"].dt.strftime("%H:%M:%S"),
+        _duration=plain["EndDate"] - plain["StartDate"]
+    )
+    kept = []
+    compacted = []
+    for _, group in keyed.groupby(group_cols + ["_start_time", "_duration"], dropna=False, sort=False):
+        group = group.sort_values("StartDate")
+        template = _infer_template(group)
+        if template is None:
+            kept.append(group)
+        else:
+            compacted.append(template)
+
+    result = pd.concat(kept + compacted + [templates]).drop(columns=["_start_time", "_duration"])
+    return result.sort_values("StartDate", kind="stable").reset_index(drop=True)
+
+def _infer_template(group):
+    if len(group) < MIN_SERIES_LENGTH:
+        return None
+
+    starts = list(group["StartDate"])
+    duration = group["_duration"].iloc[0]
+    recurrence = Recurrence("WEEKLY", 1, frozenset(s.weekday() for s in starts), starts[-1].to_pydatetime())
+    expanded = [start for _, start in occurrence_starts(starts[0], duration, recurrence, starts[0], starts[-1] + duration)]
+    if expanded != [s.to_pydatetime() for s in starts]:
+        return None
+
+    template = group.iloc[[0]].copy()
+    template["RRule"] = format_rrule(recurrence)
+    return template
+
+#python -m app_components.recurrence compact casino_events.csv casino_events_compact.csv
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recurring event tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compact_parser = commands.add_parser("compact", help="Rewrite repeated rows as RRule templates")
+    compact_parser.add_argument("csv_path")
+    compact_parser.add_argument("out_path")
+    args = parser.parse_args(argv)
+
+    if args.command == "compact":
+        from .storage import CsvBackend, format_event_dates
+        df = CsvBackend(args.csv_path).load()
+        compacted = format_event_dates(compact_events(df))
+        compacted.to_csv(args.out_path, index=False)
+        print(f"Wrote {len(compacted)} rows ({len(df)} before) to {args.out_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import diskcache
+import multiprocess
+import psutil
+from dash import DiskcacheManager
+
+#Shared on-disk cache: holds rendered weeks and Dash background-callback jobs for every worker
+CACHE_DIR = os.environ.get("RENDER_CACHE_DIR", ".render_cache")
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", "4"))
+RENDER_TIMEOUT = 60
+RENDER_TTL = 24 * 3600
+RENDER_POLL = 0.01
+STREAM_BLOCK_SIZE = 64 * 1024
+DATE_KEY = re.compile(r"\d{4}-\d{2}-\d{2}")
+#Imported once by the job fork server, so each job starts with the app and event store already loaded
+JOB_PRELOAD = ["app"]
+JOB_RESULT_KEEP = 10
+
+cache = diskcache.Cache(CACHE_DIR)
+
+#Background jobs are forked from a single-threaded fork server instead of the worker. A child forked from a
+#threaded worker inherits SQLite's locks and mutexes from whichever request thread was inside the cache at
+#that moment, and can hang or sit on the cache write lock until diskcache times out (60s for every writer).
+#Dash's terminate_job and job_running also race the job exiting on its own (psutil.NoSuchProcess, a 500 on
+#the poll); that just means the job is over.
+class RenderJobManager(DiskcacheManager):
+    def __init__(self, cache, **kwargs):
+        super().__init__(cache, **kwargs)
+        self.job_context = multiprocess.get_context("forkserver")
+        self.job_context.set_forkserver_preload(JOB_PRELOAD)
+
+    def call_job_fn(self, key, job_fn, args, context):
+        proc = self.job_context.Process(target=job_fn, args=(key, self._make_progress_key(key), args, context))
+        proc.start()
+        return proc.pid
+
+    #Identical requests share one result key; the first poll to read it would clear it and leave the others with
+    #nothing (an empty 204), so the result is kept for a few seconds instead
+    def get_result(self, key, job):
+        result = self.handle.get(key, self.UNDEFINED)
+        if result is self.UNDEFINED:
+            return self.UNDEFINED
+        self.handle.touch(key, expire=JOB_RESULT_KEEP)
+        self.clear_cache_entry(self._make_progress_key(key))
+        if job:
+            self.terminate_job(job)
+        return result
+
+    def terminate_job(self, job):
+        try:
+            super().terminate_job(job)
+        except psutil.NoSuchProcess:
+            pass
+
+    def job_running(self, job):
+        try:
+            return super().job_running(job)
+        except psutil.NoSuchProcess:
+            return False
+
+background_callback_manager = RenderJobManager(cache)
+
+#Caps concurrent renders across all processes sharing the cache directory, one key per slot
+RENDER_SLOTS = [("render-slot", index) for index in range(RENDER_WORKERS)]
+
+_pool = None
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+#Threads and locks don't survive fork (gunicorn workers, background jobs); start fresh in the child
+def _reset_after_fork():
+    global _pool, _inflight_lock
+    _pool = None
+    _inflight.clear()
+    _inflight_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="render")
+    return _pool
+
+#Render locks and slots are keys holding their owner's (pid, thread). Dash kills background jobs mid-render (a
+#cancel, or a poll that found a sibling's result for identical requests), so a key whose process is gone is
+#reclaimed instead of waited out until it expires.
+def _claim(lock_key):
+    if cache.add(lock_key, (os.getpid(), threading.get_ident()), expire=RENDER_TIMEOUT):
+        return True
+    with cache.transact():
+        owner = cache.get(lock_key)
+        if owner is not None and not psutil.pid_exists(owner[0]):
+            cache.delete(lock_key)
+    return False
+
+def _release(lock_key):
+    with cache.transact():
+        if cache.get(lock_key) == (os.getpid(), threading.get_ident()):
+            cache.delete(lock_key)
+
+@contextmanager
+def _render_slot():
+    while True:
+        slot = next((slot for slot in RENDER_SLOTS if _claim(slot)), None)
+        if slot is not None:
+            break
+        time.sleep(RENDER_POLL)
+    try:
+        yield
+    finally:
+        _release(slot)
+
+#Take the per-key render lock, or return the render another process finished while we waited
+def _acquire_render(key, lock_key):
+    while not _claim(lock_key):
+        result = cache.get(key)
+        if result is not None:
+            return result
+        time.sleep(RENDER_POLL)
+    return None
+
+def _render_once(key, render_fn, args):
+    lock_key = ("render-lock",) + key
+    try:
+        #Lock per key so other processes wait for this render instead of repeating it
+        result = _acquire_render(key, lock_key)
+        if result is not None:
+            return result
+        try:
+            result = cache.get(key)
+            if result is None:
+                with _render_slot():
+                    result = render_fn(*args)
+                cache.set(key, result, expire=RENDER_TTL)
+        finally:
+            _release(lock_key)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+#Single-flight render: concurrent requests for the same key wait on one in-progress render
+def get_or_render(key, render_fn, *args):
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _get_pool().submit(_render_once, key, render_fn, args)
+            _inflight[key] = future
+
+    return future.result(timeout=RENDER_TIMEOUT)
+
+def week_cache_key(version, week_start, breakpoint, view_mode='week'):
+    return (view_mode, version, week_start.strftime('%Y-%m-%d'), breakpoint)
+
+#Drop rendered weeks, days and ongoing lists dated before cutoff; their keys all carry the date third
+def evict_before(cutoff, target=cache):
+    cutoff = cutoff.strftime('%Y-%m-%d')
+    evicted = 0
+    for key in list(target.iterkeys()):
+        if isinstance(key, tuple) and len(key) > 2 and isinstance(key[2], str) and DATE_KEY.fullmatch(key[2]) and key[2] < cutoff:
+            evicted += target.delete(key)
+    return evicted
+
+def _read_blocks(handle):
+    with handle:
+        for block in iter(lambda: handle.read(STREAM_BLOCK_SIZE), b""):
+            yield block
+
+#Pass text chunks through to the client while spooling them to disk; cached only once the stream completes
+def _tee_into_cache(key, chunks):
+    with tempfile.TemporaryFile() as spool:
+        for chunk in chunks:
+            data = chunk.encode("utf-8")
+            spool.write(data)
+            yield data
+        spool.seek(0)
+        cache.set(key, spool, read=True, expire=RENDER_TTL)
+
+#Streamed body for key: replayed from the cache file when present, otherwise produced by chunks_fn
+def cached_stream(key, chunks_fn, *args):
+    cached = cache.get(key, read=True)
+    if cached is not None:
+        return _read_blocks(cached)
+    return _tee_into_cache(key, chunks_fn(*args))
@@ -0,0 +1,200 @@
+import argparse
+import hashlib
+import sys
+from datetime import datetime
+from flask import Response, jsonify, request
+from .api import day_payload, event_payload, week_payload
+from .data import get_event_store, get_indexed_frame
+from .export import ics_chunks, ndjson_chunks
+from .geo import casinos_near, filter_casinos
+from .render_cache import cached_stream
+from .search import search_events
+from .utils import PDT, get_week_range
+
+SEARCH_LIMIT = 200
+SEARCH_COLUMNS = ["id", "EventName", "Casino", "StartDate", "EndDate"]
+NEARBY_COLUMNS = ["casino", "miles"]
+#Calendar clients re-poll often; they revalidate with If-None-Match and mostly get 304s
+EXPORT_MAX_AGE = 300
+
+def parse_date_arg(name):
+    value = request.args.get(name)
+    return PDT.localize(datetime.strptime(value, '%Y-%m-%d')) if value else None
+
+def parse_date_path(value):
+    return PDT.localize(datetime.strptime(value, '%Y-%m-%d'))
+
+#?limit=50, capped at SEARCH_LIMIT; a negative limit would slice rows off the end instead
+def parse_limit_arg():
+    limit = int(request.args.get("limit", SEARCH_LIMIT))
+    if limit < 0:
+        raise ValueError(f"negative limit {limit}")
+    return min(limit, SEARCH_LIMIT)
+
+#?near=47.61,-122.33&radius=50 -> {"lat", "lon", "radius"}, or None without near
+def parse_near_arg():
+    value = request.args.get("near")
+    if not value:
+        return None
+    lat, lon = (float(part) for part in value.split(","))
+    return {"lat": lat, "lon": lon, "radius": float(request.args.get("radius", 50))}
+
+#Compact row arrays (column names sent once) keyed by row position in the current data version
+def event_rows(df, positions):
+    rows = df.iloc[positions]
+    return [
+        [int(pos), name, casino, start, end]
+        for pos, name, casino, start, end in zip(
+            positions,
+            rows["EventName"],
+            rows["Casino"],
+            rows["StartDate"].dt.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            rows["EndDate"].dt.strftime('%Y-%m-%dT%H:%M:%S%z')
+        )
+    ]
+
+#JSON endpoints served straight from the event store, outside the Dash callback protocol
+def register_routes(server):
+
+    #/api/search?q=hot+seat&casino=ilani&location=ridgefield&start=2025-04-01&end=2025-04-30&near=45.6,-122.6&radius=50
+    @server.route("/api/search")
+    def api_search():
+        try:
+            start = parse_date_arg("start")
+            end = parse_date_arg("end")
+            limit = parse_limit_arg()
+            near = parse_near_arg()
+        except ValueError:
+            return jsonify(error="Dates must be YYYY-MM-DD, limit a non-negative integer and near lat,lon"), 400
+
+        store = get_event_store()
+        positions = search_events(
+            store,
+            text=request.args.get("q"),
+            casinos=filter_casinos(request.args.getlist("casino"), near),
+            location=request.args.get("location"),
+            start=start,
+            end=end
+        )
+
+        return jsonify(
+            version=store.version,
+            total=len(positions),
+            columns=SEARCH_COLUMNS,
+            rows=event_rows(get_indexed_frame(store)[0], positions[:limit])
+        )
+
+    #/api/nearby?near=47.61,-122.33&radius=50 -> casinos within 50 miles, nearest first
+    @server.route("/api/nearby")
+    def api_nearby():
+        try:
+            near = parse_near_arg()
+        except ValueError:
+            return jsonify(error="near must be lat,lon and radius a number"), 400
+        if near is None:
+            return jsonify(error="near=lat,lon is required"), 400
+        return jsonify(
+            columns=NEARBY_COLUMNS,
+            rows=[[casino, round(miles, 1)] for casino, miles in casinos_near(near["lat"], near["lon"], near["radius"])]
+        )
+
+    #/api/week/2025-04-09 -> blocks of the week containing that date
+    @server.route("/api/week/<date>")
+    def api_week(date):
+        try:
+            week_start, _ = get_week_range(parse_date_path(date))
+        except ValueError:
+            return jsonify(error="Date must be YYYY-MM-DD"), 400
+        store = get_event_store()
+        return jsonify(version=store.version, **week_payload(store, week_start))
+
+    @server.route("/api/day/<date>")
+    def api_day(date):
+        try:
+            day_start = parse_date_path(date)
+        except ValueError:
+            return jsonify(error="Date must be YYYY-MM-DD"), 400
+        store = get_event_store()
+        return jsonify(version=store.version, **day_payload(store, day_start))
+
+    @server.route("/api/event/<int:event_id>")
+    def api_event(event_id):
+        store = get_event_store()
+        event = event_payload(store, event_id)
+        if event is None:
+            return jsonify(error="No such event"), 404
+        return jsonify(version=store.version, **event)
+
+    #/export/events.ics?casino=ilani&start=2025-04-01 (subscribe from a calendar app)
+    @server.route("/export/events.ics")
+    def export_ics():
+        return export_response("ics", ics_chunks, "text/calendar", "casino-events.ics")
+
+    #/export/events.ndjson?start=2025-04-01&end=2025-04-30
+    @server.route("/export/events.ndjson")
+    def export_ndjson():
+        return export_response("ndjson", ndjson_chunks, "application/x-ndjson", "casino-events.ndjson")
+
+#Streamed export for the request's filters, cached and ETagged per (data version, format, filters)
+def export_response(kind, chunks_fn, mimetype, filename):
+    try:
+        start = parse_date_arg("start")
+        end = parse_date_arg("end")
+    except ValueError:
+        return jsonify(error="Dates must be YYYY-MM-DD"), 400
+    casinos = tuple(sorted(request.args.getlist("casino")))
+
+    store = get_event_store()
+    filters = (kind, store.version, request.args.get("start"), request.args.get("end")) + casinos
+    etag = hashlib.sha1(repr(filters).encode("utf-8")).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        body = cached_stream(("export", etag), chunks_fn, store, start, end, casinos)
+        response = Response(body, mimetype=mimetype)
+        response.headers["Content-Disposition"] = f"inline; filename={filename}"
+
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = EXPORT_MAX_AGE
+    return response
+
+#(query string, expected status, most rows allowed) for /api/search
+SEARCH_CHECKS = [
+    ("limit=-1", 400, 0),
+    ("limit=abc", 400, 0),
+    ("limit=0", 200, 0),
+    ("limit=5", 200, 5),
+    (f"limit={SEARCH_LIMIT * 10}", 200, SEARCH_LIMIT),
+    ("q=%21%21%21", 200, 0),
+    ("q=-+%2F", 200, 0),
+    ("location=%2C", 200, 0)
+]
+
+#Requests SEARCH_CHECKS through the app's test client against the loaded events; returns the number of failures
+def check():
+    from app import server
+    client = server.test_client()
+    failures = 0
+    for query, status, max_rows in SEARCH_CHECKS:
+        response = client.get(f"/api/search?{query}")
+        rows = response.get_json().get("rows", [])
+        ok = response.status_code == status and len(rows) <= max_rows
+        failures += not ok
+        print(f"/api/search?{query}: {response.status_code}, {len(rows)} rows" + ("" if ok else f" (expected {status}, at most {max_rows} rows)"))
+    return failures
+
+#python -m app_components.routes check
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JSON endpoint tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("check", help="Request edge cases of the JSON endpoints and verify the responses")
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        failures = check()
+        print("OK" if not failures else f"FAILED ({failures})")
+        sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
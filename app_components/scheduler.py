@@ -0,0 +1,195 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+import diskcache
+from .render_cache import evict_before
+from .utils import MIN_WEEK_OFFSET, PDT, shift_days, week_sunday
+
+WEEK_SCHEDULER = os.environ.get("WEEK_SCHEDULER", "1") != "0"
+#Upcoming week is rendered this long before it becomes the current one
+PREWARM_LEAD = timedelta(minutes=10)
+#Upper bound on one sleep, so suspend or clock changes are noticed within a few minutes
+MAX_SLEEP = 300
+
+def pdt_now():
+    return datetime.now(PDT)
+
+#Rolls the current week at the PDT boundary: re-anchors offsets, evicts weeks past MIN_WEEK_OFFSET, pre-warms
+class WeekScheduler:
+    def __init__(self, clock=pdt_now, warmers=(), evict=evict_before):
+        self.clock = clock
+        self.warmers = list(warmers)
+        self.evict = evict
+        self.anchor = week_sunday(clock())
+        self.warmed = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    #Week that offset 0 refers to; only moves when the scheduler rolls, or follows the clock when it isn't running
+    def current_sunday(self):
+        if self._thread is None:
+            return week_sunday(self.clock())
+        with self._lock:
+            return self.anchor
+
+    def week_start(self, week_offset):
+        return shift_days(self.current_sunday(), 7 * week_offset)
+
+    def warm(self, week_start):
+        for warmer in self.warmers:
+            try:
+                warmer(week_start)
+            except Exception as exc:
+                print(f"Pre-warm of week {week_start:%Y-%m-%d} failed: {exc!r}")
+        self.warmed = week_start
+
+    def roll(self, sunday):
+        with self._lock:
+            self.anchor = sunday
+        evicted = self.evict(shift_days(sunday, 7 * MIN_WEEK_OFFSET))
+        print(f"Week rolled to {sunday:%Y-%m-%d}; evicted {evicted} cached renders")
+        #Normally warmed before the boundary; not if the process was down at the time
+        if self.warmed != sunday:
+            self.warm(sunday)
+
+    #One scheduling step at the injected clock's time; returns seconds until the next step is due
+    def tick(self):
+        now = self.clock()
+        sunday = week_sunday(now)
+        if sunday != self.anchor:
+            self.roll(sunday)
+
+        upcoming = shift_days(sunday, 7)
+        if self.warmed != upcoming and now >= upcoming - PREWARM_LEAD:
+            self.warm(upcoming)
+        due = upcoming if self.warmed == upcoming else upcoming - PREWARM_LEAD
+        return max((due - self.clock()).total_seconds(), 0)
+
+    def _run(self):
+        delay = 0
+        while not self._stop.wait(min(delay, MAX_SLEEP)):
+            try:
+                delay = self.tick()
+            except Exception as exc:
+                print(f"Week scheduler step failed: {exc!r}")
+                delay = MAX_SLEEP
+
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if not self.running():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="week-scheduler", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+scheduler = WeekScheduler()
+
+#Callbacks register what to render for a week before it becomes current
+def on_new_week(warmer):
+    scheduler.warmers.append(warmer)
+    return warmer
+
+def current_sunday():
+    return scheduler.current_sunday()
+
+def week_start_for(week_offset):
+    return scheduler.week_start(week_offset)
+
+#Runs before every request, so the thread starts in the processes that serve the app (each gunicorn worker,
+#whether or not the app was preloaded) and never in background-callback jobs or ingest pools forked from them
+def start_week_scheduler():
+    if WEEK_SCHEDULER and not scheduler.running():
+        scheduler.start()
+
+#The scheduler thread doesn't survive fork and may have held the lock; a forked child keeps the parent's
+#anchor but gets fresh sync primitives
+def _reset_after_fork():
+    scheduler._lock = threading.Lock()
+    scheduler._stop = threading.Event()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+#Steps a scheduler through n_weeks from start on a fake clock, sleeping as _run would, against a scratch cache
+#seeded with one render per week. Every boundary must pre-warm the upcoming week inside PREWARM_LEAD, roll
+#exactly at Sunday 00:00 PDT (DST weeks included) and evict only weeks past MIN_WEEK_OFFSET.
+#Returns the number of failures.
+def check(start, n_weeks=3):
+    now = PDT.localize(start)
+    first = week_sunday(now)
+    scratch_dir = tempfile.mkdtemp(prefix="scheduler-check-")
+    scratch = diskcache.Cache(scratch_dir)
+    seeded = [shift_days(first, 7 * offset) for offset in range(MIN_WEEK_OFFSET - 2, n_weeks + 2)]
+    for week in seeded:
+        scratch.set(("week", "check", week.strftime('%Y-%m-%d'), 0), True)
+
+    warms, rolls = [], []
+
+    def evict(cutoff):
+        evicted = evict_before(cutoff, scratch)
+        rolls.append((now, cutoff, evicted))
+        return evicted
+
+    week_scheduler = WeekScheduler(clock=lambda: now, warmers=[lambda week_start: warms.append((now, week_start))], evict=evict)
+    end = shift_days(first, 7 * n_weeks) + timedelta(hours=1)
+    while now < end:
+        delay = week_scheduler.tick()
+        now = PDT.normalize(now + timedelta(seconds=min(max(delay, 1), MAX_SLEEP)))
+
+    failures = 0
+    for week in range(1, n_weeks + 1):
+        sunday = shift_days(first, 7 * week)
+        warmed = [at for at, week_start in warms if week_start == sunday]
+        rolled = [(at, cutoff, evicted) for at, cutoff, evicted in rolls if week_sunday(at) == sunday]
+        problems = []
+        if len(warmed) != 1 or not sunday - PREWARM_LEAD <= warmed[0] < sunday:
+            problems.append(f"pre-warmed at {[f'{at:%a %H:%M}' for at in warmed]}")
+        if len(rolled) != 1 or not sunday <= rolled[0][0] < sunday + timedelta(seconds=MAX_SLEEP):
+            problems.append(f"rolled at {[f'{at:%a %H:%M}' for at, _, _ in rolled]}")
+        elif rolled[0][1] != shift_days(sunday, 7 * MIN_WEEK_OFFSET):
+            problems.append(f"evicted before {rolled[0][1]:%Y-%m-%d}")
+        failures += bool(problems)
+        print(f"week of {sunday:%Y-%m-%d}: " + ("; ".join(problems) if problems else
+              f"pre-warmed {warmed[0]:%a %H:%M}, rolled {rolled[0][0]:%a %H:%M %Z}, evicted {rolled[0][2]}"))
+
+    cutoff = shift_days(first, 7 * (n_weeks + MIN_WEEK_OFFSET)).strftime('%Y-%m-%d')
+    remaining = sorted(key[2] for key in scratch.iterkeys())
+    if remaining != [week.strftime('%Y-%m-%d') for week in seeded if week.strftime('%Y-%m-%d') >= cutoff]:
+        print(f"cache left with {remaining}, expected everything from {cutoff}")
+        failures += 1
+    if week_scheduler.week_start(0) != shift_days(first, 7 * n_weeks):
+        print(f"offset 0 is {week_scheduler.week_start(0):%Y-%m-%d} after the run")
+        failures += 1
+    scratch.close()
+    shutil.rmtree(scratch_dir, ignore_errors=True)
+    return failures
+
+#python -m app_components.scheduler check --start 2025-03-05 --weeks 3
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Week scheduler tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    check_parser = commands.add_parser("check", help="Drive the scheduler over a fake clock and verify pre-warm, roll and evict")
+    check_parser.add_argument("--start", type=lambda value: datetime.strptime(value, "%Y-%m-%d"), default=datetime(2025, 3, 5))
+    check_parser.add_argument("--weeks", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        failures = check(args.start, args.weeks)
+        print("OK" if not failures else f"FAILED ({failures})")
+        sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
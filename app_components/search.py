@@ -0,0 +1,107 @@
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, NamedTuple
+import numpy as np
+import pandas as pd
+from .data import get_indexed_frame
+from .span_index import query_overlapping
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+TEXT_COLUMNS = ["EventName", "Offer", "Location"]
+
+#Inverted token indexes (token -> sorted row positions) plus one row bitmap per casino
+class SearchIndex(NamedTuple):
+    text_postings: Dict[str, np.ndarray]
+    text_vocab: list
+    location_postings: Dict[str, np.ndarray]
+    location_vocab: list
+    casino_bitmaps: Dict[str, np.ndarray]
+    n_rows: int
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+def _build_postings(texts):
+    postings = defaultdict(list)
+    for pos, text in enumerate(texts):
+        for token in set(tokenize(text)):
+            postings[token].append(pos)
+    return {token: np.array(rows, dtype=np.int64) for token, rows in postings.items()}
+
+def build_search_index(df):
+    text = df[TEXT_COLUMNS[0]].fillna("")
+    for col in TEXT_COLUMNS[1:]:
+        text = text + " " + df[col].fillna("")
+    text_postings = _build_postings(text)
+    location_postings = _build_postings(df["Location"].fillna(""))
+
+    casinos = df["Casino"].to_numpy()
+    casino_bitmaps = {casino: casinos == casino for casino in df["Casino"].dropna().unique()}
+
+    return SearchIndex(
+        text_postings=text_postings,
+        text_vocab=sorted(text_postings),
+        location_postings=location_postings,
+        location_vocab=sorted(location_postings),
+        casino_bitmaps=casino_bitmaps,
+        n_rows=len(df)
+    )
+
+_indexes = {}
+_index_lock = threading.Lock()
+
+#Built once per data version, on first use
+def get_search_index(store):
+    index = _indexes.get(store.version)
+    if index is None:
+        with _index_lock:
+            index = _indexes.get(store.version)
+            if index is None:
+                index = build_search_index(get_indexed_frame(store)[0])
+                _indexes.clear()
+                _indexes[store.version] = index
+    return index
+
+#Rows matching every query token; each token also matches as a prefix ("hot" -> "hotel", "hotels").
+#A query with no tokens (only punctuation) matches nothing rather than everything.
+def _match_tokens(query, postings, vocab, n_rows):
+    tokens = tokenize(query)
+    mask = np.full(n_rows, bool(tokens))
+    for token in tokens:
+        token_mask = np.zeros(n_rows, dtype=bool)
+        i = bisect_left(vocab, token)
+        while i < len(vocab) and vocab[i].startswith(token):
+            token_mask[postings[vocab[i]]] = True
+            i += 1
+        mask &= token_mask
+    return mask
+
+def casino_mask(index, casinos):
+    mask = np.zeros(index.n_rows, dtype=bool)
+    for casino in casinos:
+        bitmap = index.casino_bitmaps.get(casino)
+        if bitmap is not None:
+            mask |= bitmap
+    return mask
+
+#Row positions matching all given filters; any filter left as None is ignored
+def search_events(store, text=None, casinos=None, location=None, start=None, end=None):
+    index = get_search_index(store)
+    mask = np.ones(index.n_rows, dtype=bool)
+
+    if text:
+        mask &= _match_tokens(text, index.text_postings, index.text_vocab, index.n_rows)
+    if location:
+        mask &= _match_tokens(location, index.location_postings, index.location_vocab, index.n_rows)
+    if casinos:
+        mask &= casino_mask(index, casinos)
+    if start is not None or end is not None:
+        in_range = np.zeros(index.n_rows, dtype=bool)
+        range_start = pd.Timestamp(0, tz="UTC") if start is None else start
+        range_end = pd.Timestamp.max.tz_localize("UTC") if end is None else end
+        in_range[query_overlapping(get_indexed_frame(store)[1], range_start, range_end)] = True
+        mask &= in_range
+
+    return np.flatnonzero(mask)
@@ -0,0 +1,62 @@
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+
+#Interval index over event spans: start times sorted once, so a range query is two binary searches
+class SpanIndex(NamedTuple):
+    starts: np.ndarray
+    ends: np.ndarray
+    positions: np.ndarray
+    max_span: int
+
+#Index arrays are shared by every thread serving the same store, so they are made read-only
+def frozen(array):
+    array.setflags(write=False)
+    return array
+
+def to_ns(series):
+    return series.dt.tz_convert("UTC").dt.as_unit("ns").array.asi8
+
+def build_span_index(df):
+    starts = to_ns(df["StartDate"])
+    ends = to_ns(df["EndDate"])
+
+    #Rows with unparseable dates never match a range, leave them out
+    valid = ~(pd.isna(df["StartDate"]).to_numpy() | pd.isna(df["EndDate"]).to_numpy())
+    positions = np.flatnonzero(valid)
+    positions = positions[np.argsort(starts[positions], kind="stable")]
+    spans = ends[positions] - starts[positions]
+
+    return SpanIndex(
+        starts=frozen(starts[positions]),
+        ends=frozen(ends[positions]),
+        positions=frozen(positions),
+        max_span=int(spans.max()) if len(spans) else 0
+    )
+
+#Index over df followed by the rows of appended (at positions offset, offset+1, ...) without re-sorting df
+def extend_span_index(index, appended, offset):
+    new = build_span_index(appended)
+    at = np.searchsorted(index.starts, new.starts, side="right")
+    return SpanIndex(
+        starts=frozen(np.insert(index.starts, at, new.starts)),
+        ends=frozen(np.insert(index.ends, at, new.ends)),
+        positions=frozen(np.insert(index.positions, at, new.positions + offset)),
+        max_span=max(index.max_span, new.max_span)
+    )
+
+#Row positions of events with StartDate < range_end and EndDate > range_start, in frame order
+def query_overlapping(index, range_start, range_end):
+    start_ns = pd.Timestamp(range_start).value
+    end_ns = pd.Timestamp(range_end).value
+
+    #No event lasts longer than max_span, so anything starting earlier can't reach range_start
+    lo = np.searchsorted(index.starts, start_ns - index.max_span, side="right")
+    hi = np.searchsorted(index.starts, end_ns, side="left")
+    hits = index.positions[lo:hi][index.ends[lo:hi] > start_ns]
+    return np.sort(hits)
+
+def events_in_range(df, range_start, range_end, span_index=None):
+    if span_index is None:
+        return df[(df["EndDate"] > range_start) & (df["StartDate"] < range_end)]
+    return df.iloc[query_overlapping(span_index, range_start, range_end)]
@@ -0,0 +1,230 @@
+import argparse
+import json
+import shutil
+from datetime import datetime, timedelta
+from html import escape
+from pathlib import Path
+import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
+from dash import dcc
+from dash.development.base_component import Component
+from .data import get_event_store, query_events
+from .layout import get_sticky_header, week_label_style
+from .plotting import generate_weekly_view, generate_day_view_html, get_ongoing_events, format_ongoing_lines
+from .utils import BREAKPOINTS, BREAKPOINT_WIDTHS, MIN_WEEK_OFFSET, PDT, get_dynamic_sizes, shift_days, week_sunday
+
+HTML_ATTRIBUTES = {"id": "id", "className": "class", "title": "title"}
+#Open-ended recurring events always have a next week, so the forward scan stops a year out
+MAX_BUILD_WEEKS = 52
+
+#Same test the next-week button uses
+def has_events(store, week_start):
+    return not query_events(store, week_start, shift_days(week_start, 6)).empty
+
+#Offsets the live app can navigate to: back to MIN_WEEK_OFFSET, forward while the next week has events
+def reachable_offsets(store, current_sunday):
+    last = 0
+    while last < MAX_BUILD_WEEKS and has_events(store, shift_days(current_sunday, 7 * (last + 1))):
+        last += 1
+    return range(MIN_WEEK_OFFSET, last + 1)
+
+def css_style(style):
+    return ";".join(
+        "".join("-" + c.lower() if c.isupper() else c for c in prop) + f":{value}"
+        for prop, value in style.items()
+    )
+
+#Static HTML for Dash html.* components; graphs become placeholders the shell plots from data-figure
+def component_html(component):
+    if component is None:
+        return ""
+    if isinstance(component, (list, tuple)):
+        return "".join(component_html(child) for child in component)
+    if not isinstance(component, Component):
+        return escape(str(component))
+
+    attrs = {html_attr: getattr(component, prop, None) for prop, html_attr in HTML_ATTRIBUTES.items()}
+    attrs["style"] = css_style(getattr(component, "style", None) or {})
+    if isinstance(component, dcc.Graph):
+        attrs["class"] = "static-graph"
+        attrs["data-figure"] = pio.to_json(component.figure)
+        tag, children = "div", None
+    else:
+        tag, children = component._type.lower(), getattr(component, "children", None)
+
+    attr_text = "".join(f' {name}="{escape(str(value))}"' for name, value in attrs.items() if value and not isinstance(value, dict))
+    return f"<{tag}{attr_text}>{component_html(children)}</{tag}>"
+
+def write_text(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+def build_week(out_dir, store, week_start):
+    events = query_events(store, week_start, shift_days(week_start, 7))
+    date = week_start.strftime('%Y-%m-%d')
+    lines = format_ongoing_lines(get_ongoing_events(week_start, events))
+
+    for breakpoint, width in enumerate(BREAKPOINT_WIDTHS):
+        fig, _ = generate_weekly_view(week_start, events, width)
+        write_text(out_dir / "weeks" / date / f"{breakpoint}.json", f'{{"figure": {fig.to_json()}, "ongoing": {json.dumps(lines)}}}')
+
+    for day_index in range(7):
+        day_start = shift_days(week_start, day_index)
+        day_events = query_events(store, day_start, shift_days(day_start, 1))
+        for breakpoint, width in enumerate(BREAKPOINT_WIDTHS):
+            body = component_html(generate_day_view_html(day_events, day_start, width))
+            write_text(out_dir / "days" / day_start.strftime('%Y-%m-%d') / f"{breakpoint}.html", body)
+
+    return {
+        "start": date,
+        "label": f"Events for the Week of {week_start.strftime('%B %d')} - {(week_start + timedelta(days=6)).strftime('%B %d, %Y')}"
+    }
+
+#Pre-render every reachable week x breakpoint, plus the header and a navigation shell, into out_dir
+def build_site(out_dir, today=None):
+    out_dir = Path(out_dir)
+    store = get_event_store()
+    current_sunday = week_sunday(today or datetime.now(PDT).date())
+
+    weeks = [build_week(out_dir, store, shift_days(current_sunday, 7 * offset))
+             for offset in reachable_offsets(store, current_sunday)]
+
+    for breakpoint, width in enumerate(BREAKPOINT_WIDTHS):
+        header = component_html(get_sticky_header(store, width, []))
+        label_style = css_style(week_label_style(*get_dynamic_sizes(width)))
+        write_text(out_dir / "header" / f"{breakpoint}.html", header + f'<div id="week-label" style="{escape(label_style)}"></div>')
+
+    manifest = {
+        "version": store.version,
+        "built": datetime.now(PDT).isoformat(timespec="seconds"),
+        "breakpoints": BREAKPOINTS,
+        "weeks": weeks
+    }
+    write_text(out_dir / "manifest.json", json.dumps(manifest))
+    #plotly.js matching the installed plotly, which serialized the figures
+    write_text(out_dir / "index.html", STATIC_SHELL.replace("{plotly_js_version}", get_plotlyjs_version()))
+
+    for css in Path("assets").glob("*.css"):
+        (out_dir / "assets").mkdir(parents=True, exist_ok=True)
+        shutil.copy(css, out_dir / "assets" / css.name)
+    return len(weeks)
+
+#Navigation shell: picks the breakpoint bucket from the window width and the current week from today's
+#PDT date (so it keeps opening on this week after the build ages), and fetches pre-rendered pieces
+STATIC_SHELL = '''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <title>Casino Event Calendar</title>
+    <link rel="stylesheet" href="assets/custom.css">
+    <link rel="stylesheet" href="assets/modal.css">
+    <script src="https://cdn.plot.ly/plotly-{plotly_js_version}.min.js"></script>
+</head>
+<body style="font-family: Segoe UI, sans-serif; margin: 0 auto; padding-bottom: 40px">
+    <div id="sticky-header" style="position: sticky; top: 0; background-color: white; z-index: 1000"></div>
+    <div id="weekly-graph"></div>
+    <ul id="overflow-list" style="color: #00008B"></ul>
+    <div id="event-modal" class="modal"><div class="modal-content" style="opacity: 1; pointer-events: auto">
+        <div id="event-modal-body" style="max-height: 80vh; overflow: scroll; padding: 10px"></div>
+        <button onclick="closeModal('event-modal')" style="display: block; margin: 10px auto 0">Close</button>
+    </div></div>
+    <div id="day-modal" class="modal"><div id="day-modal-content" class="modal-content" style="opacity: 1; pointer-events: auto">
+        <div id="day-modal-body" style="max-height: 80vh"></div>
+        <button onclick="closeModal('day-modal')" style="display: block; margin: 10px auto 0">Close</button>
+    </div></div>
+<script>
+const state = {manifest: null, index: 0, bucket: null};
+const bucketFor = width => state.manifest.breakpoints.filter(b => b <= width).length;
+const getText = url => fetch(url).then(r => r.text());
+const todayPdt = () => new Date().toLocaleDateString("en-CA", {timeZone: "America/Los_Angeles"});
+const fmt = v => new Date(v).toLocaleString("en-US", {month: "short", day: "2-digit", year: "numeric", hour: "2-digit", minute: "2-digit"});
+
+function closeModal(id) { document.getElementById(id).className = "modal closing"; }
+
+function showEvent(data) {
+    const labels = {EventName: "Event", Casino: "Casino", Location: "Location", StartDate: "Event Starts", EndDate: "Event Ends", Offer: "Offer"};
+    const body = document.getElementById("event-modal-body");
+    body.innerHTML = "";
+    for (const [key, label] of Object.entries(labels)) {
+        if (!(key in data)) continue;
+        const row = document.createElement("div");
+        row.style.marginBottom = "6px";
+        row.innerHTML = `<strong style="color:#6A5ACD">${label}: </strong>`;
+        row.append(key.endsWith("Date") ? fmt(data[key]) : (data[key] ?? ""));
+        body.append(row);
+    }
+    document.getElementById("event-modal").className = "modal show";
+}
+
+async function showDay(date) {
+    const body = document.getElementById("day-modal-body");
+    body.innerHTML = await getText(`days/${date}/${state.bucket}.html`);
+    for (const graph of body.querySelectorAll(".static-graph")) {
+        const fig = JSON.parse(graph.dataset.figure);
+        await Plotly.newPlot(graph, fig.data, fig.layout, {displayModeBar: false});
+        graph.on("plotly_click", e => showEvent(e.points[0].customdata[0]));
+    }
+    document.getElementById("day-modal").className = "modal show";
+}
+
+async function render() {
+    const week = state.manifest.weeks[state.index];
+    const payload = await fetch(`weeks/${week.start}/${state.bucket}.json`).then(r => r.json());
+    const graph = document.getElementById("weekly-graph");
+    await Plotly.react(graph, payload.figure.data, payload.figure.layout, {displayModeBar: false, responsive: true});
+    graph.removeAllListeners && graph.removeAllListeners("plotly_click");
+    graph.on("plotly_click", e => {
+        const data = e.points[0].customdata[0];
+        if (data.type !== "day_click") return showEvent(data);
+        const day = new Date(`${week.start}T12:00:00`);
+        day.setDate(day.getDate() + data.day_index);
+        showDay(day.toLocaleDateString("en-CA"));
+    });
+    document.getElementById("week-label").textContent = week.label;
+    document.getElementById("overflow-list").innerHTML = payload.ongoing.map(line => `<li>${line.replace(/</g, "&lt;")}</li>`).join("");
+    document.getElementById("prev-button").disabled = state.index === 0;
+    document.getElementById("next-button").disabled = state.index === state.manifest.weeks.length - 1;
+}
+
+async function loadHeader() {
+    document.getElementById("sticky-header").innerHTML = await getText(`header/${state.bucket}.html`);
+    document.getElementById("prev-button").onclick = () => { state.index--; render(); };
+    document.getElementById("next-button").onclick = () => { state.index++; render(); };
+}
+
+async function resize() {
+    const bucket = bucketFor(window.innerWidth);
+    if (bucket === state.bucket) return;
+    state.bucket = bucket;
+    await loadHeader();
+    await render();
+}
+
+fetch("manifest.json").then(r => r.json()).then(manifest => {
+    state.manifest = manifest;
+    const today = todayPdt();
+    state.index = Math.max(manifest.weeks.filter(week => week.start <= today).length - 1, 0);
+    window.addEventListener("resize", resize);
+    resize();
+});
+</script>
+</body>
+</html>
+'''
+
+#python -m app_components.static_site build --out build
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-render the calendar as static files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="Render every reachable week and breakpoint")
+    build_parser.add_argument("--out", default="build")
+    build_parser.add_argument("--today", type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(), default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        n_weeks = build_site(args.out, args.today)
+        print(f"Rendered {n_weeks} weeks x {len(BREAKPOINT_WIDTHS)} breakpoints into {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+import argparse
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+import pandas as pd
+from .utils import PDT
+from .recurrence import series_keys
+
+DEFAULT_CSV_PATH = "casino_events.csv"
+EVENT_COLUMNS = ["EventName", "Casino", "Location", "Offer", "StartDate", "EndDate", "RRule", "SeriesId"]
+TEXT_COLUMNS = ["EventName", "Casino", "Location", "Offer", "RRule"]
+IMPORT_BATCH_SIZE = 5000
+#Block size for hashing the already-parsed prefix, which must be unchanged for new bytes to count as an append
+APPEND_HASH_BLOCK = 1024 * 1024
+#Cold tier: events that ended before the navigable window, pickled with their row labels
+ARCHIVE_DIR = os.environ.get("EVENT_ARCHIVE_DIR", ".event_archive")
+ARCHIVE_KEEP_SECONDS = 24 * 3600
+#The CSV's own M/D/YYYY H:MM style
+DATE_FORMAT = "%m/%d/%Y %H:%M"
+
+def parse_event_dates(df):
+    for col in ["StartDate", "EndDate"]:
+        parsed = pd.to_datetime(df[col], format=DATE_FORMAT, errors='coerce')
+        #Hand-edited files in another format fall back to inference
+        if (parsed.isna() & df[col].notna()).any():
+            parsed = pd.to_datetime(df[col], errors='coerce')
+        df[col] = parsed
+        if df[col].dt.tz is None:
+            df[col] = df[col].dt.tz_localize(PDT)
+        else:
+            df[col] = df[col].dt.tz_convert(PDT)
+    return df
+
+#Back to the CSV's own M/D/YYYY H:MM style
+def format_event_dates(df):
+    df = df.copy()
+    for col in ["StartDate", "EndDate"]:
+        dates = df[col].dt
+        df[col] = (
+            dates.month.astype(str) + "/" + dates.day.astype(str) + "/" + dates.year.astype(str) + " " +
+            dates.hour.astype(str) + ":" + dates.strftime("%M")
+        )
+    return df
+
+def to_epoch_seconds(series):
+    return series.dt.tz_convert("UTC").dt.as_unit("s").astype("int64")
+
+def from_epoch_seconds(series):
+    return pd.to_datetime(series, unit="s", utc=True).dt.tz_convert(PDT)
+
+#Where the last parse stopped, and a hash of everything before it
+class ParsedState(NamedTuple):
+    inode: int
+    offset: int
+    header: bytes
+    digest: bytes
+
+#Flat CSV read whole into memory; range queries are answered by the in-memory span index
+class CsvBackend:
+    supports_range_queries = False
+
+    def __init__(self, csv_path=DEFAULT_CSV_PATH):
+        self.path = csv_path
+        self._parsed = None
+
+    #Changes whenever the CSV is rewritten (used as a cache key)
+    def version(self):
+        stat = os.stat(self.path)
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    def load(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+            inode = os.fstat(f.fileno()).st_ino
+        #Without a trailing newline an append could extend the last row, so only whole-line files are tracked
+        self._parsed = None
+        if data.endswith(b"\n"):
+            header = data[:data.index(b"\n") + 1]
+            self._parsed = ParsedState(inode, len(data), header, hashlib.sha1(data).digest())
+        return parse_event_dates(pd.read_csv(io.BytesIO(data)))
+
+    #Rows appended since the last parse, or None when the file was rewritten rather than appended to
+    def read_appended(self):
+        state = self._parsed
+        if state is None:
+            return None
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_ino != state.inode:
+                return None
+            #A rewrite can keep the bytes near the old end, so the whole parsed prefix is compared
+            prefix = hashlib.sha1()
+            remaining = state.offset
+            while remaining:
+                block = f.read(min(APPEND_HASH_BLOCK, remaining))
+                if not block:
+                    return None
+                prefix.update(block)
+                remaining -= len(block)
+            if prefix.digest() != state.digest:
+                return None
+            delta = f.read()
+
+        #A row still being written is left for the next call
+        delta = delta[:delta.rfind(b"\n") + 1]
+        if not delta:
+            return parse_event_dates(pd.read_csv(io.BytesIO(state.header)))
+        prefix.update(delta)
+        self._parsed = ParsedState(state.inode, state.offset + len(delta), state.header, prefix.digest())
+        return parse_event_dates(pd.read_csv(io.BytesIO(state.header + delta)))
+
+#Embedded SQLite store; week and day windows are pushed down as indexed range SQL
+class SqliteBackend:
+    supports_range_queries = True
+
+    def __init__(self, db_path):
+        self.path = db_path
+        self.uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        self._local = threading.local()
+
+    #Read-only connection pooled per thread, reopened in forked workers
+    def connection(self):
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            self._local.conn = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+            self._local.pid = pid
+        return self._local.conn
+
+    def _meta(self, key):
+        row = self.connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def version(self):
+        return self._meta("version")
+
+    def _read(self, sql, params=()):
+        df = pd.read_sql_query(sql, self.connection(), params=params)
+        for col in ["StartDate", "EndDate"]:
+            df[col] = from_epoch_seconds(df[col])
+        #Row ids line up with positions in load(), like the CSV frame's RangeIndex
+        df.index = df.pop("id") - 1
+        df.index.name = None
+        return df
+
+    def load(self):
+        return self._read(f"SELECT id, {', '.join(EVENT_COLUMNS)} FROM events ORDER BY id")
+
+    def load_templates(self):
+        return self._read(f"SELECT id, {', '.join(EVENT_COLUMNS)} FROM events WHERE RRule IS NOT NULL ORDER BY id")
+
+    #Plain events with StartDate < range_end and EndDate > range_start, optionally for some casinos only
+    def query_range(self, range_start, range_end, casinos=None):
+        start = int(pd.Timestamp(range_start).timestamp())
+        end = int(pd.Timestamp(range_end).timestamp())
+        max_span = int(self._meta("max_span") or 0)
+
+        #Lower bound on StartDate keeps the (StartDate, EndDate) index scan to the window
+        sql = f"SELECT id, {', '.join(EVENT_COLUMNS)} FROM events WHERE StartDate >= ? AND StartDate < ? AND EndDate > ? AND RRule IS NULL"
+        params = [start - max_span, end, start]
+        if casinos:
+            sql += f" AND Casino IN ({', '.join('?' * len(casinos))})"
+            params += list(casinos)
+        return self._read(sql + " ORDER BY id", params)
+
+    def casinos(self):
+        return [row[0] for row in self.connection().execute("SELECT DISTINCT Casino FROM events WHERE Casino IS NOT NULL")]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+DROP TABLE IF EXISTS events_import;
+CREATE TABLE events_import (
+    id INTEGER PRIMARY KEY,
+    EventName TEXT,
+    Casino TEXT,
+    Location TEXT,
+    Offer TEXT,
+    StartDate INTEGER NOT NULL,
+    EndDate INTEGER NOT NULL,
+    RRule TEXT,
+    SeriesId INTEGER
+);
+"""
+
+INDEXES = [
+    "CREATE INDEX idx_events_span ON events (StartDate, EndDate)",
+    "CREATE INDEX idx_events_casino ON events (Casino)"
+]
+
+#Replace a SQLite store's events with parsed frames, one transaction per frame
+def write_events(chunks, db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    #Fresh side table, so the live one stays readable during the import; indexes are built once at the end
+    #instead of maintained row by row
+    conn.executescript(SCHEMA)
+
+    imported = max_span = 0
+    next_id = 1
+    series_ids = {}
+    for chunk in chunks:
+        if "RRule" not in chunk.columns:
+            chunk = chunk.assign(RRule=None)
+
+        starts = to_epoch_seconds(chunk["StartDate"])
+        ends = to_epoch_seconds(chunk["EndDate"])
+        if len(chunk):
+            max_span = max(max_span, int((ends - starts).max()))
+
+        #Series ids stay consistent across chunks
+        chunk.index = range(next_id, next_id + len(chunk))
+        series = [series_ids.setdefault(key, len(series_ids)) for key in series_keys(chunk)]
+
+        text = chunk[TEXT_COLUMNS].astype(object).where(chunk[TEXT_COLUMNS].notna(), None)
+        rows = zip(
+            chunk.index,
+            text["EventName"], text["Casino"], text["Location"], text["Offer"],
+            starts.tolist(), ends.tolist(), text["RRule"], series
+        )
+        with conn:
+            conn.executemany("INSERT INTO events_import VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        next_id += len(chunk)
+        imported += len(chunk)
+
+    #Swap it in with its indexes and version in one transaction; readers see the old table until the commit
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("DROP TABLE IF EXISTS events")
+    conn.execute("ALTER TABLE events_import RENAME TO events")
+    for statement in INDEXES:
+        conn.execute(statement)
+    conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+        ("version", f"{time.time_ns():x}-{imported:x}"),
+        ("max_span", str(max_span))
+    ])
+    conn.commit()
+    conn.close()
+    return imported
+
+#Bulk-load a CSV into SQLite, skipping rows whose dates don't parse
+def import_csv(csv_path, db_path, batch_size=IMPORT_BATCH_SIZE):
+    skipped = 0
+
+    def valid_chunks():
+        nonlocal skipped
+        for chunk in pd.read_csv(csv_path, chunksize=batch_size):
+            chunk = parse_event_dates(chunk)
+            valid = chunk["StartDate"].notna() & chunk["EndDate"].notna()
+            skipped += int((~valid).sum())
+            yield chunk[valid]
+
+    return write_events(valid_chunks(), db_path), skipped
+
+#Archive file for one source, data version and window start; shared by every worker on the same disk
+def archive_path(source, version, hot_from):
+    name = hashlib.sha1(str(source).encode("utf-8")).hexdigest()[:12]
+    return Path(ARCHIVE_DIR) / f"{name}-{version}-{hot_from.strftime('%Y%m%d')}.pkl"
+
+def archive_window(path):
+    return Path(path).stem.rsplit("-", 1)[1]
+
+#Written under a temporary name and renamed, so readers never see a partial file.
+#Other workers may still be on the previous window's archive until their next request demotes, so
+#only archives from before it are pruned, and only once they are a day old.
+def write_archive(df, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    df.to_pickle(tmp)
+    os.replace(tmp, path)
+
+    source = path.name.split("-", 1)[0]
+    others = [old for old in path.parent.glob(f"{source}-*.pkl") if old != path]
+    previous = max((archive_window(old) for old in others if archive_window(old) < archive_window(path)), default=None)
+    for old in others:
+        if previous is not None and archive_window(old) < previous and time.time() - old.stat().st_mtime > ARCHIVE_KEEP_SECONDS:
+            old.unlink(missing_ok=True)
+    return path
+
+def read_archive(path):
+    return pd.read_pickle(path)
+
+_backends = {}
+_backend_lock = threading.Lock()
+
+#EVENT_DB=path/to/events.db switches every worker to SQLite; otherwise the CSV is used
+def get_backend(source=None):
+    source = source or os.environ.get("EVENT_DB") or DEFAULT_CSV_PATH
+    backend = _backends.get(source)
+    if backend is None:
+        with _backend_lock:
+            backend = _backends.get(source)
+            if backend is None:
+                is_sqlite = Path(source).suffix.lower() in (".db", ".sqlite", ".sqlite3")
+                backend = SqliteBackend(source) if is_sqlite else CsvBackend(source)
+                _backends[source] = backend
+    return backend
+
+#python -m app_components.storage import casino_events.csv casino_events.db
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Casino event storage tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Bulk-load a CSV into a SQLite event store")
+    import_parser.add_argument("csv_path")
+    import_parser.add_argument("db_path")
+    import_parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        imported, skipped = import_csv(args.csv_path, args.db_path, args.batch_size)
+        print(f"Imported {imported} events into {args.db_path} ({skipped} skipped with unparseable dates)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from .api import build_day_payload, build_week_payload
+from .data import get_event_store, get_indexed_frame, query_events
+from .plotting import build_day_figure, format_ongoing_lines, generate_multiweek_view, generate_weekly_view
+from .utils import BREAKPOINT_WIDTHS, shift_days, week_sunday
+
+#One unit of work: (kind, week start, day index, screen width, casino filter)
+def make_tasks(store, n_tasks, seed):
+    df = get_indexed_frame(store)[0]
+    first = week_sunday(df["StartDate"].min())
+    casinos = sorted(df["Casino"].dropna().unique())
+    rng = random.Random(seed)
+    tasks = []
+    for _ in range(n_tasks):
+        week_start = shift_days(first, 7 * rng.randrange(12))
+        casino_filter = tuple(sorted(rng.sample(casinos, min(len(casinos), rng.randrange(3)))))
+        tasks.append((rng.choice(["week", "month", "day", "api-week", "api-day"]), week_start, rng.randrange(7),
+                      rng.choice(BREAKPOINT_WIDTHS), casino_filter))
+    return tasks
+
+#Everything a request renders from the shared store, reduced to a digest
+def run_task(store, task):
+    kind, week_start, day_index, screen_width, casinos = task
+    day_start = shift_days(week_start, day_index)
+    if kind == "week":
+        events = query_events(store, week_start, shift_days(week_start, 7), casinos)
+        fig, long_spanning = generate_weekly_view(week_start, events, screen_width)
+        body = fig.to_json() + json.dumps(format_ongoing_lines(long_spanning))
+    elif kind == "month":
+        events = query_events(store, week_start, shift_days(week_start, 28), casinos)
+        fig, long_spanning = generate_multiweek_view(week_start, events, screen_width)
+        body = fig.to_json() + json.dumps(format_ongoing_lines(long_spanning))
+    elif kind == "day":
+        fig = build_day_figure(query_events(store, day_start, shift_days(day_start, 1), casinos), day_start, screen_width)
+        body = "none" if fig is None else fig.to_json()
+    elif kind == "api-week":
+        body = json.dumps(build_week_payload(store, week_start))
+    else:
+        body = json.dumps(build_day_payload(store, day_start))
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+#Content hash of the store's frames, index arrays and mappings, to prove no request modified them
+def store_fingerprint(store):
+    digest = hashlib.sha1()
+    for frame in (store.df, store.templates):
+        if frame is not None and not frame.empty:
+            digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+            digest.update(repr(list(frame.columns)).encode("utf-8"))
+    if store.span_index is not None:
+        for array in (store.span_index.starts, store.span_index.ends, store.span_index.positions):
+            digest.update(np.ascontiguousarray(array).tobytes())
+    digest.update(repr(sorted(store.week_appends.items())).encode("utf-8"))
+    digest.update(repr(sorted(store.series_ids.items())).encode("utf-8"))
+    return digest.hexdigest()
+
+#Renders every task serially, then again from many threads at once over the same snapshot; the
+#digests must match and the store must be byte-for-byte unchanged. Returns the number of failures.
+def stress(threads=16, n_tasks=400, rounds=3, seed=0):
+    store = get_event_store()
+    before = store_fingerprint(store)
+    tasks = make_tasks(store, n_tasks, seed)
+
+    started = time.perf_counter()
+    expected = [run_task(store, task) for task in tasks]
+    serial = time.perf_counter() - started
+    print(f"serial: {len(tasks)} renders in {serial:.2f}s")
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for round_number in range(rounds):
+            order = list(range(len(tasks)))
+            random.Random(seed + round_number + 1).shuffle(order)
+            started = time.perf_counter()
+            results = dict(zip(order, pool.map(lambda i: run_task(store, tasks[i]), order)))
+            elapsed = time.perf_counter() - started
+            mismatched = [i for i in order if results[i] != expected[i]]
+            failures += len(mismatched)
+            print(f"round {round_number + 1}: {len(tasks)} renders on {threads} threads in {elapsed:.2f}s, {len(mismatched)} mismatched")
+            for i in mismatched[:5]:
+                print(f"  mismatch: {tasks[i][0]} {tasks[i][1]:%Y-%m-%d} day={tasks[i][2]} width={tasks[i][3]} casinos={tasks[i][4]}")
+
+    if store_fingerprint(store) != before:
+        print("store snapshot was modified during the run")
+        failures += 1
+    return failures
+
+#python -m app_components.stress --threads 16 --tasks 400 --rounds 3
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent render stress check over one shared event store")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--tasks", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failures = stress(args.threads, args.tasks, args.rounds, args.seed)
+    print("OK" if not failures else f"FAILED ({failures})")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import unicodedata
+from functools import lru_cache
+from .utils import BREAKPOINT_WIDTHS, get_breakpoint, get_dynamic_sizes
+
+#Event labels are drawn in this family so the advance table below matches what the browser renders
+LABEL_FONT_FAMILY = "Arial, Helvetica, sans-serif"
+
+#Advance widths in 1/1000 em for printable ASCII (Arial/Helvetica metrics)
+ARIAL_ADVANCES = {
+    " ": 278, "!": 278, '"': 355, "#": 556, "$": 556, "%": 889, "&": 667, "'": 191,
+    "(": 333, ")": 333, "*": 389, "+": 584, ",": 278, "-": 333, ".": 278, "/": 278,
+    "0": 556, "1": 556, "2": 556, "3": 556, "4": 556, "5": 556, "6": 556, "7": 556, "8": 556, "9": 556,
+    ":": 278, ";": 278, "<": 584, "=": 584, ">": 584, "?": 556, "@": 1015,
+    "A": 667, "B": 667, "C": 722, "D": 722, "E": 667, "F": 611, "G": 778, "H": 722, "I": 278,
+    "J": 500, "K": 667, "L": 556, "M": 833, "N": 722, "O": 778, "P": 667, "Q": 778, "R": 722,
+    "S": 667, "T": 611, "U": 722, "V": 667, "W": 944, "X": 667, "Y": 667, "Z": 611,
+    "[": 278, "\\": 278, "]": 278, "^": 469, "_": 556, "`": 333,
+    "a": 556, "b": 556, "c": 500, "d": 556, "e": 556, "f": 278, "g": 556, "h": 556, "i": 222,
+    "j": 222, "k": 500, "l": 222, "m": 833, "n": 556, "o": 556, "p": 556, "q": 556, "r": 333,
+    "s": 500, "t": 278, "u": 556, "v": 500, "w": 722, "x": 500, "y": 500, "z": 500,
+    "{": 334, "|": 260, "}": 334, "~": 584, "’": 222, "–": 556, "—": 1000, "é": 556
+}
+DEFAULT_ADVANCE = 556
+WIDE_ADVANCE = 1000
+
+ELLIPSIS = "..."
+#Block widths are bucketed to 1/20 of a day; rounding down keeps a fitted label inside its block
+WIDTH_STEP = 0.05
+#Figure side margins and the gap kept between a label and its block edges
+FIGURE_MARGIN_PX = 40
+LABEL_PADDING_PX = 6
+FIT_CACHE_SIZE = 65536
+
+def glyph_advance(char):
+    advance = ARIAL_ADVANCES.get(char)
+    if advance is not None:
+        return advance
+    return WIDE_ADVANCE if unicodedata.east_asian_width(char) in ("W", "F") else DEFAULT_ADVANCE
+
+#Annotation font size in px for a breakpoint bucket
+@lru_cache(maxsize=None)
+def label_font_px(breakpoint):
+    font_sizes, _ = get_dynamic_sizes(BREAKPOINT_WIDTHS[breakpoint])
+    return float(font_sizes["event_block"].replace("rem", "")) * 12
+
+#Narrowest day column in the bucket, so labels never overflow at any width it covers
+def day_width_px(breakpoint):
+    return (BREAKPOINT_WIDTHS[breakpoint] - FIGURE_MARGIN_PX) / 7
+
+def text_width_px(text, font_px):
+    return sum(glyph_advance(char) for char in text) * font_px / 1000
+
+@lru_cache(maxsize=FIT_CACHE_SIZE)
+def _fit_label(label, width_bucket, breakpoint):
+    font_px = label_font_px(breakpoint)
+    available = width_bucket * WIDTH_STEP * day_width_px(breakpoint) - 2 * LABEL_PADDING_PX
+    if text_width_px(label, font_px) <= available:
+        return label
+
+    budget = available - text_width_px(ELLIPSIS, font_px)
+    used = 0
+    cut = 0
+    for char in label:
+        used += glyph_advance(char) * font_px / 1000
+        if used > budget:
+            break
+        cut += 1
+    return label[:cut].rstrip() + ELLIPSIS if cut else ""
+
+#Longest prefix of label (plus an ellipsis when cut) that fits a block block_width days wide
+def fit_label(label, block_width, screen_width):
+    width_bucket = max(int(block_width / WIDTH_STEP + 1e-9), 0)
+    return _fit_label(str(label), width_bucket, get_breakpoint(screen_width))
+
+def label_font_size(screen_width):
+    return label_font_px(get_breakpoint(screen_width))
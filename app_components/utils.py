@@ -1,9 +1,25 @@
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from pytz import timezone
 from typing import Tuple
 
 PDT = timezone('America/Los_Angeles')
 
+#Widths where the rendered output changes: font sizes (480/768), overflow box (760), label trimming (1024/1440)
+BREAKPOINTS = (480, 760, 768, 1024, 1440)
+#How far back navigation goes
+MIN_WEEK_OFFSET = -6
+
+#One width inside each breakpoint bucket: below 480, 480-759, 760-767, 768-1023, 1024-1439, 1440+
+BREAKPOINT_WIDTHS = (320, 480, 760, 768, 1024, 1440)
+
+def get_breakpoint(screen_width):
+    return bisect_right(BREAKPOINTS, screen_width)
+
+#Every width in a bucket renders the same, so the bucket's representative width stands in for all of them
+def bucket_width(bucket):
+    return BREAKPOINT_WIDTHS[min(max(int(bucket), 0), len(BREAKPOINT_WIDTHS) - 1)]
+
 def get_dynamic_sizes(screen_width):
     if screen_width < 480:
         font_sizes = {
@@ -64,7 +80,17 @@ def get_dynamic_sizes(screen_width):
         }
     return font_sizes, padding_sizes
 
+#Midnight PDT of the Sunday starting the week of when: a date, or a datetime in any time zone
+def week_sunday(when):
+    day = when.astimezone(PDT).date() if isinstance(when, datetime) else when
+    return PDT.localize(datetime.combine(day - timedelta(days=(day.weekday() + 1) % 7), datetime.min.time()))
+
+#Midnight stays midnight across DST changes
+def shift_days(start, days):
+    return PDT.localize(start.replace(tzinfo=None) + timedelta(days=days))
+
 def get_week_range(clicked_date: datetime) -> Tuple[datetime, datetime]:
     week_start = clicked_date - timedelta(days=(clicked_date.weekday() + 1) % 7)
-    return week_start.replace(hour=0, minute=0, second=0, microsecond=0), week_start + timedelta(days=7)
+    week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
+    return week_start, week_start + timedelta(days=7)
 